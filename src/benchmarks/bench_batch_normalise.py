@@ -0,0 +1,94 @@
+"""
+Compare the scalar review normalisation and summary functions with their
+NumPy batch versions and check that both return identical output.
+
+Run from the ``src`` directory:
+
+    python -m benchmarks.bench_batch_normalise --sizes 10000 100000 1000000
+"""
+from extractors.batch_normalise import (
+    build_product_summary_batch,
+    normalise_secondary_ratings_batch,
+    numpy_available,
+)
+from extractors.review_utils import build_product_summary, normalise_secondary_ratings
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import argparse
+import random
+import time
+
+LABELS = ("Comfort", "Quality", "Sizing", "Style")
+RECOMMENDATIONS = ("Yes", "No", "Would recommend", "Would not recommend", None)
+
+
+def build_reviews(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    reviews: List[Dict[str, Any]] = []
+    for idx in range(count):
+        review: Dict[str, Any] = {
+            "Product ID": "90171336",
+            "Review ID": f"review-{idx}",
+            "Rating": rng.randint(1, 5),
+            "Helpful Votes": rng.randint(0, 20),
+            "Unhelpful Votes": rng.randint(0, 5),
+            "Secondary Ratings": [
+                {"Label": label, "Value": rng.randint(1, 5)}
+                for label in LABELS
+                if rng.random() < 0.8
+            ],
+        }
+        recommendation = rng.choice(RECOMMENDATIONS)
+        if recommendation is not None:
+            review["Recommendation"] = recommendation
+        reviews.append(review)
+    return reviews
+
+
+def _time(func: Callable[[], Any], repeat: int) -> Tuple[float, Any]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+        help="Reviews per product to benchmark",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if not numpy_available():
+        print("NumPy is not installed; the batch functions fall back to the scalar ones.")
+
+    print(f"{'reviews':>9} {'stage':>10} {'scalar ms':>10} {'batch ms':>9} {'speedup':>8}")
+    for size in args.sizes:
+        reviews = build_reviews(size)
+
+        scalar_s, scalar_norm = _time(lambda: normalise_secondary_ratings(reviews), args.repeat)
+        batch_s, batch_norm = _time(lambda: normalise_secondary_ratings_batch(reviews), args.repeat)
+        if scalar_norm != batch_norm:
+            raise AssertionError(f"normalise output differs at {size} reviews")
+        print(f"{size:9d} {'normalise':>10} {scalar_s * 1000:10.1f} "
+              f"{batch_s * 1000:9.1f} {scalar_s / batch_s:7.1f}x")
+
+        scalar_s, scalar_summary = _time(
+            lambda: build_product_summary("url", "90171336", scalar_norm), args.repeat
+        )
+        batch_s, batch_summary = _time(
+            lambda: build_product_summary_batch("url", "90171336", scalar_norm), args.repeat
+        )
+        if scalar_summary != batch_summary:
+            raise AssertionError(f"summary output differs at {size} reviews")
+        print(f"{size:9d} {'summary':>10} {scalar_s * 1000:10.1f} "
+              f"{batch_s * 1000:9.1f} {scalar_s / batch_s:7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,159 @@
+"""
+Compare full ``json.loads`` decoding of embedded page-state blobs with the
+review-only decoder in ``extractors.json_stream``.
+
+Run from the ``src`` directory:
+
+    python -m benchmarks.bench_json_stream --products 5000 20000 50000
+
+A second table times two inputs that used to make the owner search
+quadratic: a page-level "reviewBody" key behind the whole blob and a
+malformed review object. The decoder gives up on both after a small
+fraction of the work of a full decode, so the decoder plus the full-decode
+fallback the scraper then runs should cost about as much as the full decode
+alone.
+"""
+from extractors.json_stream import decode_review_nodes, find_review_nodes
+from typing import Any, Callable, Dict, List, Optional
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+
+def build_page_state(product_count: int, review_count: int, seed: int = 0) -> str:
+    """
+    Build a page-state blob dominated by product, pricing and
+    recommendation data, with a small review section in the middle.
+    """
+    rng = random.Random(seed)
+    items = [
+        {
+            "tcin": str(10_000_000 + idx),
+            "title": f"Product {idx} {{colour}} edition",
+            "price": {
+                "current_retail": round(rng.uniform(1, 200), 2),
+                "reg_retail": round(rng.uniform(1, 200), 2),
+                "formatted": "$%.2f" % rng.uniform(1, 200),
+            },
+            "variations": [{"size": size, "in_stock": rng.random() < 0.8} for size in "SML"],
+            "bullets": ["Machine wash", "Imported", 'Fits "true" to size'],
+        }
+        for idx in range(product_count)
+    ]
+    reviews = [
+        {
+            "@type": "Review",
+            "@id": f"review-{idx}",
+            "author": {"name": f"shopper{{{idx}}}"},
+            "reviewRating": {"ratingValue": rng.randint(1, 5)},
+            "reviewBody": 'Great {fit}, "runs small" \\ would buy again',
+            "datePublished": "2025-08-03T21:56:08.000+00:00",
+            "upvoteCount": rng.randint(0, 10),
+        }
+        for idx in range(review_count)
+    ]
+    state = {
+        "search": {"items": items[: product_count // 2]},
+        "product": {"reviews": {"results": reviews}},
+        "recommendations": {"items": items[product_count // 2:]},
+    }
+    return json.dumps(state)
+
+
+def build_page_level_key(product_count: int, review_count: int) -> str:
+    """
+    Blob whose root object also owns a "reviewBody" key, after all its
+    other content.
+    """
+    state = json.loads(build_page_state(product_count, review_count))
+    state["reviewBody"] = "Page-level review summary"
+    return json.dumps(state)
+
+
+def build_malformed_review(product_count: int, review_count: int) -> str:
+    text = build_page_state(product_count, review_count)
+    key = text.index('"reviewRating":')
+    return text[:key] + '"reviewRating": {,' + text[key + len('"reviewRating":'):]
+
+
+def _decode_with_fallback(text: str) -> Optional[List[Dict[str, Any]]]:
+    nodes = decode_review_nodes(text)
+    if nodes is not None:
+        return nodes
+    return _full_tree_or_none(text)
+
+
+def _walk_full_tree(text: str) -> List[Dict[str, Any]]:
+    return find_review_nodes(json.loads(text))
+
+
+def _measure(func: Callable[[str], Any], text: str, repeat: int) -> Dict[str, Any]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(text)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    func(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak, "result": result}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--products", type=int, nargs="+", default=[5000, 20000, 50000],
+        help="Non-review items per blob (controls blob size)",
+    )
+    parser.add_argument("--reviews", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'blob MB':>8} {'full ms':>9} {'stream ms':>10} {'speedup':>8} "
+          f"{'full peak MB':>13} {'stream peak MB':>15}")
+    for product_count in args.products:
+        text = build_page_state(product_count, args.reviews)
+        full = _measure(_walk_full_tree, text, args.repeat)
+        stream = _measure(decode_review_nodes, text, args.repeat)
+        if full["result"] != stream["result"]:
+            raise AssertionError("Streaming decoder returned different review nodes")
+        print(
+            f"{len(text) / 1e6:8.2f} {full['seconds'] * 1000:9.2f} "
+            f"{stream['seconds'] * 1000:10.2f} "
+            f"{full['seconds'] / stream['seconds']:7.1f}x "
+            f"{full['peak_bytes'] / 1e6:13.2f} {stream['peak_bytes'] / 1e6:15.2f}"
+        )
+
+    print()
+    print(f"{'blob MB':>8} {'case':>12} {'full ms':>9} {'stream+fallback ms':>19}")
+    for product_count in args.products:
+        for case, build in (
+            ("page-level", build_page_level_key),
+            ("malformed", build_malformed_review),
+        ):
+            text = build(product_count, args.reviews)
+            full = _measure(_full_tree_or_none, text, args.repeat)
+            stream = _measure(_decode_with_fallback, text, args.repeat)
+            if case == "page-level" and stream["result"] != _walk_full_tree(text):
+                raise AssertionError("Fallback returned different review nodes")
+            print(
+                f"{len(text) / 1e6:8.2f} {case:>12} {full['seconds'] * 1000:9.2f} "
+                f"{stream['seconds'] * 1000:19.2f}"
+            )
+    return 0
+
+
+def _full_tree_or_none(text: str) -> Optional[List[Dict[str, Any]]]:
+    try:
+        return _walk_full_tree(text)
+    except ValueError:
+        return None
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,416 @@
+"""
+End-to-end load test for the scraper against a local mock Target server.
+
+Run from the ``src`` directory, for example:
+
+    python -m benchmarks.load_test --products 200 --concurrency 8 \\
+        --latency lognormal --latency-ms 120 --error-rate 0.05 --throttle-rate 0.02
+
+The mock server runs in a child process so the reported CPU time and memory
+belong to the scraper only.
+"""
+from benchmarks.mock_target_server import (
+    MockServerConfig,
+    MockTargetServer,
+    STATS_PATH,
+    add_server_arguments,
+    config_from_args,
+)
+from extractors.target_parser import TargetReviewsScraper
+from outputs.json_exporter import JsonExporter
+from outputs.segment_store import SegmentStore
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+import argparse
+import json
+import logging
+import math
+import multiprocessing
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib.request
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+LOGGER = logging.getLogger(__name__)
+
+FIRST_PRODUCT_ID = 10_000_000
+
+# Options main.main has no setting for. They only apply in scraper mode.
+MAIN_MODE_UNSUPPORTED = ("concurrency", "max_retries", "backoff_factor")
+
+
+@dataclass
+class LoadTestResult:
+    mode: str
+    products: int
+    wall_seconds: float
+    cpu_seconds: float
+    latencies: List[float] = field(default_factory=list)
+    failures: int = 0
+    max_rss_kb: Optional[int] = None
+    tracemalloc_peak_bytes: Optional[int] = None
+    server_stats: Dict[str, Any] = field(default_factory=dict)
+    exit_code: Optional[int] = None
+
+    def to_report(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+        return {
+            "Mode": self.mode,
+            "Products": self.products,
+            "Succeeded": self.products - self.failures,
+            "Failed": self.failures,
+            "Wall Seconds": round(self.wall_seconds, 3),
+            "Products Per Second": (
+                round(self.products / self.wall_seconds, 2)
+                if self.wall_seconds > 0
+                else 0.0
+            ),
+            "Latency p50 ms": _percentile_ms(ordered, 50),
+            "Latency p95 ms": _percentile_ms(ordered, 95),
+            "Latency p99 ms": _percentile_ms(ordered, 99),
+            "Retries": self.server_stats.get("retries"),
+            "Server Status Counts": self.server_stats.get("status_counts", {}),
+            "CPU Seconds": round(self.cpu_seconds, 3),
+            "CPU Per Product ms": (
+                round(self.cpu_seconds / self.products * 1000, 3)
+                if self.products
+                else 0.0
+            ),
+            "Max RSS KB": self.max_rss_kb,
+            "Tracemalloc Peak Bytes": self.tracemalloc_peak_bytes,
+            "Exit Code": self.exit_code,
+        }
+
+
+def _percentile_ms(ordered: List[float], pct: float) -> Optional[float]:
+    """
+    Nearest-rank percentile of an already sorted list of seconds, in ms.
+    """
+    if not ordered:
+        return None
+    rank = max(math.ceil(pct * len(ordered) / 100), 1)
+    return round(ordered[rank - 1] * 1000, 2)
+
+
+def _max_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports kilobytes
+    return int(rss / 1024) if sys.platform == "darwin" else int(rss)
+
+
+@contextmanager
+def _instrument_scraper(
+    latencies: List[float],
+    failures: List[str],
+) -> Iterator[None]:
+    """
+    Temporarily wrap ``TargetReviewsScraper.fetch_reviews_for_product`` to
+    record per-product latency and failures, whoever the caller is.
+    """
+    original = TargetReviewsScraper.fetch_reviews_for_product
+    lock = threading.Lock()
+
+    def timed(self: TargetReviewsScraper, *args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return original(self, *args, **kwargs)
+        except Exception:
+            with lock:
+                failures.append(kwargs.get("product_id") or "")
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+
+    TargetReviewsScraper.fetch_reviews_for_product = timed  # type: ignore[method-assign]
+    try:
+        yield
+    finally:
+        TargetReviewsScraper.fetch_reviews_for_product = original  # type: ignore[method-assign]
+
+
+@contextmanager
+def _instrument_exports(failures: List[str]) -> Iterator[None]:
+    """
+    Temporarily wrap the exporters main.main writes through, so products
+    that were fetched but failed to export are counted as failures.
+    """
+    originals = {
+        JsonExporter: ("write_reviews_to_file", JsonExporter.write_reviews_to_file),
+        SegmentStore: ("write_product", SegmentStore.write_product),
+    }
+    lock = threading.Lock()
+
+    def counting(name: str, original: Any) -> Any:
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            try:
+                return original(self, *args, **kwargs)
+            except Exception:
+                with lock:
+                    failures.append(name)
+                raise
+
+        return wrapper
+
+    for cls, (name, original) in originals.items():
+        setattr(cls, name, counting(name, original))
+    try:
+        yield
+    finally:
+        for cls, (name, original) in originals.items():
+            setattr(cls, name, original)
+
+
+def _serve_in_child(config: MockServerConfig, port_queue: Any) -> None:
+    server = MockTargetServer(config)
+    port_queue.put(server.base_url)
+    server.serve_forever()
+
+
+def _fetch_server_stats(base_url: str) -> Dict[str, Any]:
+    with urllib.request.urlopen(base_url + STATS_PATH, timeout=10) as resp:
+        return json.loads(resp.read().decode("utf-8"))
+
+
+def _product_url(base_url: str, product_id: str) -> str:
+    return f"{base_url}/p/synthetic-product/-/A-{product_id}"
+
+
+def run_scraper_mode(
+    urls: List[str],
+    concurrency: int,
+    scraper_kwargs: Dict[str, Any],
+    max_reviews: Optional[int],
+) -> int:
+    """
+    Drive ``TargetReviewsScraper`` directly with one scraper per worker thread.
+    Returns the number of failed products.
+    """
+    local = threading.local()
+
+    def worker(url: str) -> bool:
+        scraper = getattr(local, "scraper", None)
+        if scraper is None:
+            scraper = TargetReviewsScraper(**scraper_kwargs)
+            local.scraper = scraper
+        product_id = url.rsplit("A-", 1)[-1]
+        try:
+            scraper.fetch_reviews_for_product(
+                product_url=url,
+                product_id=product_id,
+                max_reviews=max_reviews,
+            )
+        except Exception as exc:  # noqa: BLE001
+            LOGGER.debug("Product %s failed: %s", product_id, exc)
+            return False
+        return True
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(worker, urls))
+    return results.count(False)
+
+
+def run_main_mode(
+    urls: List[str],
+    scraper_kwargs: Dict[str, Any],
+    max_reviews: Optional[int] = None,
+) -> int:
+    """
+    Drive the full ``main.main`` pipeline (scrape, summarise, export) into a
+    temporary directory. Returns main's exit code.
+
+    main builds its own scraper from settings, so only the settings main
+    reads (user agent, timeout, max reviews) are passed
+    through. See MAIN_MODE_UNSUPPORTED for the options it cannot honour.
+    """
+    import main as cli
+
+    with tempfile.TemporaryDirectory(prefix="target-load-test-") as tmp:
+        settings: Dict[str, Any] = {
+            "user_agent": scraper_kwargs["user_agent"],
+            "request_timeout": scraper_kwargs["timeout"],
+            "max_reviews": max_reviews,
+        }
+        config_path = Path(tmp) / "settings.json"
+        config_path.write_text(json.dumps(settings), encoding="utf-8")
+        return cli.main(
+            list(urls) + ["--config", str(config_path), "--output-dir", tmp]
+        )
+
+
+def run_load_test(
+    server_config: MockServerConfig,
+    products: int,
+    mode: str = "scraper",
+    concurrency: int = 1,
+    scraper_kwargs: Optional[Dict[str, Any]] = None,
+    max_reviews: Optional[int] = None,
+    trace_memory: bool = False,
+) -> LoadTestResult:
+    """
+    Start the mock server in a child process, scrape ``products`` synthetic
+    products against it and collect throughput, latency and resource metrics.
+    """
+    kwargs: Dict[str, Any] = {
+        "user_agent": "target-load-test/1.0",
+        "timeout": 10,
+    }
+    kwargs.update(scraper_kwargs or {})
+
+    port_queue: Any = multiprocessing.Queue()
+    server_proc = multiprocessing.Process(
+        target=_serve_in_child,
+        args=(server_config, port_queue),
+        daemon=True,
+    )
+    server_proc.start()
+    try:
+        base_url = port_queue.get(timeout=10)
+        urls = [
+            _product_url(base_url, str(FIRST_PRODUCT_ID + idx))
+            for idx in range(products)
+        ]
+
+        latencies: List[float] = []
+        failures: List[str] = []
+        exit_code: Optional[int] = None
+        if trace_memory:
+            tracemalloc.start()
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+
+        with _instrument_scraper(latencies, failures):
+            if mode == "main":
+                with _instrument_exports(failures):
+                    exit_code = run_main_mode(urls, kwargs, max_reviews=max_reviews)
+            else:
+                run_scraper_mode(urls, concurrency, kwargs, max_reviews)
+
+        wall_seconds = time.perf_counter() - wall_start
+        cpu_seconds = time.process_time() - cpu_start
+        peak: Optional[int] = None
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        server_stats = _fetch_server_stats(base_url)
+    finally:
+        server_proc.terminate()
+        server_proc.join()
+
+    return LoadTestResult(
+        mode=mode,
+        products=products,
+        wall_seconds=wall_seconds,
+        cpu_seconds=cpu_seconds,
+        latencies=latencies,
+        failures=len(failures),
+        max_rss_kb=_max_rss_kb(),
+        tracemalloc_peak_bytes=peak,
+        server_stats=server_stats,
+        exit_code=exit_code,
+    )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Load test the scraper against a local mock Target server."
+    )
+    parser.add_argument(
+        "--products", type=int, default=100,
+        help="Number of synthetic products to scrape (default: 100)",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=("scraper", "main"),
+        default="scraper",
+        help="Drive TargetReviewsScraper directly or the full main.main "
+        "pipeline (default: scraper)",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=None,
+        help="Worker threads, scraper mode only (default: 1)",
+    )
+    parser.add_argument("--timeout", type=int, default=10, help="Request timeout")
+    parser.add_argument(
+        "--max-retries", type=int, default=None,
+        help="Scraper mode only (default: 3)",
+    )
+    parser.add_argument(
+        "--backoff-factor", type=float, default=None,
+        help="Scraper mode only (default: 0.5)",
+    )
+    parser.add_argument("--max-reviews", type=int, default=None)
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Track peak Python allocations with tracemalloc (slower)",
+    )
+    parser.add_argument(
+        "--report",
+        help="Optional path to write the JSON report to",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true")
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.mode == "main":
+        given = [
+            "--" + name.replace("_", "-")
+            for name in MAIN_MODE_UNSUPPORTED
+            if getattr(args, name) is not None
+        ]
+        if given:
+            parser.error(
+                f"{', '.join(given)} cannot be used with --mode main: "
+                "main.main builds its own scraper without these options"
+            )
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
+    )
+
+    result = run_load_test(
+        server_config=config_from_args(args),
+        products=args.products,
+        mode=args.mode,
+        concurrency=args.concurrency or 1,
+        scraper_kwargs={
+            "timeout": args.timeout,
+            "max_retries": args.max_retries if args.max_retries is not None else 3,
+            "backoff_factor": (
+                args.backoff_factor if args.backoff_factor is not None else 0.5
+            ),
+        },
+        max_reviews=args.max_reviews,
+        trace_memory=args.trace_memory,
+    )
+    report = result.to_report()
+    rendered = json.dumps(report, indent=2)
+    print(rendered)
+
+    if args.report:
+        Path(args.report).write_text(rendered + "\n", encoding="utf-8")
+    return 0 if result.failures == 0 and not result.exit_code else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
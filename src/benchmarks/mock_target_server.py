@@ -0,0 +1,443 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from dataclasses import dataclass, field
+import argparse
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+
+LOGGER = logging.getLogger(__name__)
+
+PRODUCT_PATH_PATTERN = re.compile(r"^/p/[^/]+/-/A-(\d+)$")
+STATS_PATH = "/__stats"
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+PAGE_TEMPLATES = ("json-ld", "html")
+
+
+@dataclass
+class MockServerConfig:
+    """
+    Behaviour of the mock Target server.
+
+    Latency is drawn per request from ``latency_distribution``:
+    - fixed: always ``latency_ms``
+    - uniform: ``latency_ms`` +/- ``latency_spread_ms``
+    - exponential: mean ``latency_ms``
+    - lognormal: mean ``latency_ms`` with shape ``latency_sigma``
+
+    ``page_template`` selects whether reviews are embedded as JSON-LD or
+    only rendered as HTML review cards.
+    """
+
+    latency_distribution: str = "fixed"
+    latency_ms: float = 50.0
+    latency_spread_ms: float = 0.0
+    latency_sigma: float = 0.5
+    page_size_bytes: int = 250_000
+    reviews_per_page: int = 20
+    page_template: str = "json-ld"
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: Optional[int] = 1
+    seed: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution {self.latency_distribution!r}. "
+                f"Expected one of: {', '.join(LATENCY_DISTRIBUTIONS)}"
+            )
+        if self.page_template not in PAGE_TEMPLATES:
+            raise ValueError(
+                f"Unknown page template {self.page_template!r}. "
+                f"Expected one of: {', '.join(PAGE_TEMPLATES)}"
+            )
+        for name in ("error_rate", "throttle_rate"):
+            value = getattr(self, name)
+            if not 0.0 <= value <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1, got {value}")
+        if self.error_rate + self.throttle_rate > 1.0:
+            raise ValueError("error_rate + throttle_rate must not exceed 1")
+
+
+@dataclass
+class MockServerStats:
+    """
+    Thread-safe request counters kept by the mock server.
+    """
+
+    requests: int = 0
+    status_counts: Dict[str, int] = field(default_factory=dict)
+    hits_per_product: Dict[str, int] = field(default_factory=dict)
+    bytes_sent: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, product_id: Optional[str], status: int, size: int) -> None:
+        with self._lock:
+            self.requests += 1
+            key = str(status)
+            self.status_counts[key] = self.status_counts.get(key, 0) + 1
+            if product_id is not None:
+                self.hits_per_product[product_id] = (
+                    self.hits_per_product.get(product_id, 0) + 1
+                )
+            self.bytes_sent += size
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            products = len(self.hits_per_product)
+            product_requests = sum(self.hits_per_product.values())
+            return {
+                "requests": self.requests,
+                "products": products,
+                "retries": product_requests - products,
+                "status_counts": dict(self.status_counts),
+                "bytes_sent": self.bytes_sent,
+            }
+
+
+class MockTargetServer:
+    """
+    Local HTTP server that serves synthetic Target product pages.
+
+    Product pages live at ``/p/<slug>/-/A-<id>`` and embed a JSON-LD block
+    with ``reviews_per_page`` reviews, padded with filler markup up to
+    ``page_size_bytes``. Request counters are available at ``/__stats``.
+    """
+
+    def __init__(
+        self,
+        config: Optional[MockServerConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.config = config or MockServerConfig()
+        self.stats = MockServerStats()
+        self._rng = random.Random(self.config.seed)
+        self._rng_lock = threading.Lock()
+        self._page_cache: Dict[str, bytes] = {}
+        self._page_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def product_url(self, product_id: str) -> str:
+        return f"{self.base_url}/p/synthetic-product/-/A-{product_id}"
+
+    def start(self) -> "MockTargetServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            name="mock-target-server",
+            daemon=True,
+        )
+        self._thread.start()
+        LOGGER.info("Mock Target server listening on %s", self.base_url)
+        return self
+
+    def serve_forever(self) -> None:
+        LOGGER.info("Mock Target server listening on %s", self.base_url)
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "MockTargetServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    # -------------------------------------------------------------------------
+    # Request behaviour
+    # -------------------------------------------------------------------------
+
+    def _draw_latency(self) -> float:
+        """
+        Return the simulated server latency in seconds.
+        """
+        cfg = self.config
+        with self._rng_lock:
+            if cfg.latency_distribution == "uniform":
+                value = self._rng.uniform(
+                    cfg.latency_ms - cfg.latency_spread_ms,
+                    cfg.latency_ms + cfg.latency_spread_ms,
+                )
+            elif cfg.latency_distribution == "exponential":
+                value = (
+                    self._rng.expovariate(1.0 / cfg.latency_ms)
+                    if cfg.latency_ms > 0
+                    else 0.0
+                )
+            elif cfg.latency_distribution == "lognormal":
+                if cfg.latency_ms > 0:
+                    mu = math.log(cfg.latency_ms) - cfg.latency_sigma ** 2 / 2
+                    value = self._rng.lognormvariate(mu, cfg.latency_sigma)
+                else:
+                    value = 0.0
+            else:
+                value = cfg.latency_ms
+        return max(value, 0.0) / 1000.0
+
+    def _draw_status(self) -> int:
+        cfg = self.config
+        with self._rng_lock:
+            roll = self._rng.random()
+        if roll < cfg.error_rate:
+            return 503
+        if roll < cfg.error_rate + cfg.throttle_rate:
+            return 429
+        return 200
+
+    def _render_product_page(self, product_id: str) -> bytes:
+        with self._page_lock:
+            cached = self._page_cache.get(product_id)
+        if cached is not None:
+            return cached
+
+        page = build_synthetic_product_page(
+            product_id=product_id,
+            review_count=self.config.reviews_per_page,
+            page_size_bytes=self.config.page_size_bytes,
+            template=self.config.page_template,
+        )
+        with self._page_lock:
+            self._page_cache[product_id] = page
+        return page
+
+    def _make_handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802
+                if self.path == STATS_PATH:
+                    body = json.dumps(server.stats.snapshot()).encode("utf-8")
+                    self._send(200, body, "application/json")
+                    return
+
+                match = PRODUCT_PATH_PATTERN.match(self.path)
+                if not match:
+                    self._send(404, b"Not found", "text/plain")
+                    server.stats.record(None, 404, 9)
+                    return
+
+                product_id = match.group(1)
+                time.sleep(server._draw_latency())
+
+                status = server._draw_status()
+                headers: Dict[str, str] = {}
+                if status == 200:
+                    body = server._render_product_page(product_id)
+                    content_type = "text/html; charset=utf-8"
+                else:
+                    body = f"Injected {status}".encode("utf-8")
+                    content_type = "text/plain"
+                    if server.config.retry_after is not None:
+                        headers["Retry-After"] = str(server.config.retry_after)
+
+                self._send(status, body, content_type, headers)
+                server.stats.record(product_id, status, len(body))
+
+            def _send(
+                self,
+                status: int,
+                body: bytes,
+                content_type: str,
+                headers: Optional[Dict[str, str]] = None,
+            ) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                LOGGER.debug("mock-server: " + format, *args)
+
+        return Handler
+
+
+def build_synthetic_product_page(
+    product_id: str,
+    review_count: int,
+    page_size_bytes: int,
+    template: str = "json-ld",
+) -> bytes:
+    """
+    Build a product page, deterministic per product ID, padded with filler
+    markup to roughly ``page_size_bytes``. Reviews are embedded as a JSON-LD
+    block or, for the ``html`` template, only as review cards.
+    """
+    rng = random.Random(product_id)
+    labels = ("comfort", "quality", "sizing", "style")
+    reviews = []
+    for idx in range(review_count):
+        reviews.append(
+            {
+                "@type": "Review",
+                "@id": f"{product_id}-review-{idx}",
+                "name": f"Synthetic review {idx}",
+                "reviewBody": "Synthetic review text for load testing. " * 3,
+                "reviewRating": {"@type": "Rating", "ratingValue": rng.randint(1, 5)},
+                "datePublished": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+                "T12:00:00.000+00:00",
+                "author": {"@type": "Person", "name": f"reviewer{rng.randint(1, 9999)}"},
+                "upvoteCount": rng.randint(0, 20),
+                "downvoteCount": rng.randint(0, 5),
+                "isVerified": rng.random() < 0.7,
+                "secondaryRatings": {label: rng.randint(1, 5) for label in labels},
+            }
+        )
+
+    if template == "html":
+        cards = "".join(
+            '<div data-test="review-card">'
+            f"<h3>{review['name']}</h3>"
+            f"<p>{review['reviewBody']}</p>"
+            f'<span aria-label="{review["reviewRating"]["ratingValue"]} out of 5 stars"></span>'
+            f'<time datetime="{review["datePublished"]}"></time>'
+            f'<span data-test="reviewer-name">{review["author"]["name"]}</span>'
+            "</div>"
+            for review in reviews
+        )
+        head = (
+            "<!DOCTYPE html><html><head>"
+            f"<title>Synthetic product {product_id}</title>"
+            "</head><body>"
+        )
+        tail = cards + "</body></html>"
+        return _pad_page(head, tail, page_size_bytes)
+
+    ld_json = json.dumps(
+        {
+            "@context": "https://schema.org",
+            "@type": "Product",
+            "sku": product_id,
+            "review": reviews,
+        }
+    )
+    head = (
+        "<!DOCTYPE html><html><head>"
+        f"<title>Synthetic product {product_id}</title>"
+        f'<script type="application/ld+json">{ld_json}</script>'
+        "</head><body>"
+    )
+    tail = "</body></html>"
+    return _pad_page(head, tail, page_size_bytes)
+
+
+def _pad_page(head: str, tail: str, page_size_bytes: int) -> bytes:
+    filler_row = '<div class="filler" data-test="product-detail">lorem ipsum</div>'
+    remaining = page_size_bytes - len(head) - len(tail)
+    filler = filler_row * max(remaining // len(filler_row), 0)
+    return (head + filler + tail).encode("utf-8")
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Register the mock server options on an argument parser.
+    """
+    parser.add_argument(
+        "--latency",
+        choices=LATENCY_DISTRIBUTIONS,
+        default="fixed",
+        help="Server latency distribution (default: fixed)",
+    )
+    parser.add_argument(
+        "--latency-ms", type=float, default=50.0,
+        help="Mean server latency in milliseconds (default: 50)",
+    )
+    parser.add_argument(
+        "--latency-spread-ms", type=float, default=0.0,
+        help="Half-width of the uniform latency distribution",
+    )
+    parser.add_argument(
+        "--latency-sigma", type=float, default=0.5,
+        help="Shape of the lognormal latency distribution",
+    )
+    parser.add_argument(
+        "--page-size", type=int, default=250_000,
+        help="Approximate product page size in bytes (default: 250000)",
+    )
+    parser.add_argument(
+        "--reviews-per-page", type=int, default=20,
+        help="Number of reviews embedded in each page (default: 20)",
+    )
+    parser.add_argument(
+        "--page-template",
+        choices=PAGE_TEMPLATES,
+        default="json-ld",
+        help="Embed reviews as JSON-LD or only as HTML review cards",
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0,
+        help="Fraction of requests answered with 503",
+    )
+    parser.add_argument(
+        "--throttle-rate", type=float, default=0.0,
+        help="Fraction of requests answered with 429",
+    )
+    parser.add_argument(
+        "--retry-after", type=int, default=1,
+        help="Retry-After seconds sent with injected errors (negative disables)",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+
+
+def config_from_args(args: argparse.Namespace) -> MockServerConfig:
+    return MockServerConfig(
+        latency_distribution=args.latency,
+        latency_ms=args.latency_ms,
+        latency_spread_ms=args.latency_spread_ms,
+        latency_sigma=args.latency_sigma,
+        page_size_bytes=args.page_size,
+        reviews_per_page=args.reviews_per_page,
+        page_template=args.page_template,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after if args.retry_after >= 0 else None,
+        seed=args.seed,
+    )
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Serve synthetic Target product pages for load testing."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
+    )
+    server = MockTargetServer(config_from_args(args), host=args.host, port=args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        LOGGER.info("Shutting down mock server")
+    finally:
+        server._httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
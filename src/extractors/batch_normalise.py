@@ -0,0 +1,263 @@
+from .review_utils import (
+    RECOMMENDATION_KEYS,
+    build_product_summary,
+    extract_recommendation_flag,
+    normalise_secondary_ratings,
+    parse_recommendation_text,
+)
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+from collections import Counter
+from contextlib import contextmanager
+from statistics import mean
+import gc
+import logging
+import sys
+import threading
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+LOGGER = logging.getLogger(__name__)
+
+_SECONDARY_VALUE_TYPES = frozenset({int, float, bool, type(None)})
+
+# Below this many reviews the collector costs less than pausing it. Typical
+# product pages stay far below it, so scraping never touches the GC state.
+GC_PAUSE_MIN_REVIEWS = 50_000
+
+_gc_pause_lock = threading.Lock()
+_gc_pause_depth = 0
+_gc_was_enabled = False
+
+
+class _FallBack(Exception):
+    """
+    Raised when a product's data is outside what the array path handles
+    exactly. The caller then uses the scalar function instead.
+    """
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+@contextmanager
+def _gc_paused(review_count: int) -> Iterator[None]:
+    """
+    Pause the cyclic garbage collector while building records for at
+    least ``GC_PAUSE_MIN_REVIEWS`` reviews. Its collections then cost more
+    than building the records. The collector is process-wide, so pauses
+    from several threads are counted and the last one to finish restores
+    the previous state.
+    """
+    global _gc_pause_depth, _gc_was_enabled
+    if review_count < GC_PAUSE_MIN_REVIEWS:
+        yield
+        return
+
+    with _gc_pause_lock:
+        if _gc_pause_depth == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pause_depth += 1
+    try:
+        yield
+    finally:
+        with _gc_pause_lock:
+            _gc_pause_depth -= 1
+            if _gc_pause_depth == 0 and _gc_was_enabled:
+                gc.enable()
+
+
+def normalise_secondary_ratings_batch(
+    reviews: Iterable[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """
+    Batch version of ``normalise_secondary_ratings`` for a whole product.
+
+    The output is one new dict per rating, so there is nothing to gain
+    from arrays here. For very large products the garbage collector is
+    paused while ``normalise_secondary_ratings`` builds the records;
+    smaller batches call it directly.
+    """
+    if not isinstance(reviews, list):
+        reviews = list(reviews)
+    with _gc_paused(len(reviews)):
+        return normalise_secondary_ratings(reviews)
+
+
+def build_product_summary_batch(
+    product_url: str,
+    product_id: str,
+    reviews: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Batch version of ``build_product_summary``.
+
+    Ratings and secondary values for the whole product are gathered into
+    NumPy arrays, and the rating distribution, averages and positive
+    percentage are computed on those arrays. Recommendation strings are
+    counted with a Counter and parsed once per distinct value. Output is
+    identical to the scalar function, which is used when NumPy is missing
+    or the data is unusual.
+    """
+    if np is None or not reviews:
+        return build_product_summary(product_url, product_id, reviews)
+    try:
+        ratings = _ratings_array(reviews)
+        recommended_count, not_recommended_count = _count_recommendations(reviews)
+        secondary_averages = _secondary_averages(reviews)
+    except Exception as exc:  # noqa: BLE001
+        # Includes errors the scalar code raises too (e.g. a NaN rating);
+        # rerunning it reproduces them exactly.
+        LOGGER.debug("Batch summary falling back to scalar path: %s", exc)
+        return build_product_summary(product_url, product_id, reviews)
+
+    rating_distribution: Dict[str, int] = {str(n): 0 for n in range(1, 6)}
+    if ratings.size:
+        counts = np.bincount(ratings[(ratings >= 1) & (ratings <= 5)], minlength=6)
+        for n in range(1, 6):
+            if counts[n]:
+                rating_distribution[str(n)] = int(counts[n])
+
+        total = int(ratings.sum())
+        # statistics.mean of ints returns an int when the division is exact
+        if total % ratings.size == 0:
+            avg_rating: float = total // ratings.size
+        else:
+            avg_rating = total / ratings.size
+        positive = int(np.count_nonzero(ratings >= 4))
+        positive_percentage = int(round(positive / ratings.size * 100))
+    else:
+        avg_rating = 0.0
+        positive_percentage = 0
+
+    return {
+        "Product URL": product_url,
+        "Product ID": product_id,
+        "Review Count": len(reviews),
+        "Recommended Count": recommended_count,
+        "Not Recommended Count": not_recommended_count,
+        "Rating Distribution": rating_distribution,
+        "Average Rating": round(avg_rating, 2),
+        "Positive Percentage": positive_percentage,
+        "Secondary Averages": secondary_averages,
+    }
+
+
+def _ratings_array(reviews: List[Dict[str, Any]]) -> "np.ndarray":
+    raw = [review.get("Rating") for review in reviews]
+    if not set(map(type, raw)) <= {int}:
+        raw = [int(r) for r in raw if isinstance(r, (int, float))]
+    try:
+        ratings = np.array(raw, dtype=np.int64)
+    except OverflowError as exc:
+        raise _FallBack("rating out of int64 range") from exc
+    if ratings.size:
+        largest = max(-int(ratings.min()), int(ratings.max()))
+        if largest * ratings.size >= 2 ** 63:
+            # ratings.sum() would wrap around silently
+            raise _FallBack("rating sum out of int64 range")
+    return ratings
+
+
+def _count_recommendations(reviews: List[Dict[str, Any]]) -> Tuple[int, int]:
+    """
+    Count recommended / not recommended reviews with
+    ``review_utils.extract_recommendation_flag``. When no review has a
+    flag key, only the free-text field matters, so each distinct text is
+    parsed once.
+    """
+    if any(key in review for review in reviews for key in RECOMMENDATION_KEYS):
+        flags = Counter(extract_recommendation_flag(review) for review in reviews)
+        return flags[True], flags[False]
+
+    texts = Counter(
+        review.get("Recommendation") or review.get("recommendation")
+        for review in reviews
+    )
+    recommended = not_recommended = 0
+    for text, count in texts.items():
+        flag = parse_recommendation_text(text)
+        if flag is True:
+            recommended += count
+        elif flag is False:
+            not_recommended += count
+    return recommended, not_recommended
+
+
+def _secondary_averages(reviews: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Per-label averages with the rules of ``review_utils._compute_secondary_averages``,
+    computed with one bincount over all secondary values of the product.
+    """
+    items = [
+        item
+        for review in reviews
+        for sec in (review.get("Secondary Ratings") or [],)
+        if isinstance(sec, list)
+        for item in sec
+        if isinstance(item, dict)
+    ]
+    if not items:
+        return []
+
+    raw_labels = [item.get("Label") or item.get("label") or "" for item in items]
+    raw_values = [item.get("Value") or item.get("value") for item in items]
+    if not set(map(type, raw_labels)) <= {str}:
+        raise _FallBack("non-string secondary labels")
+    value_types = set(map(type, raw_values))
+    if not value_types <= _SECONDARY_VALUE_TYPES:
+        raise _FallBack("non-numeric secondary values")
+
+    if type(None) in value_types:
+        # float(None) fails, so the scalar code skips these items entirely
+        keep = [value is not None for value in raw_values]
+        raw_labels = [label for label, ok in zip(raw_labels, keep) if ok]
+        raw_values = [value for value, ok in zip(raw_values, keep) if ok]
+
+    # Label codes follow the order in which each normalised label first
+    # appears, as the scalar code's bucket dict does. Raw labels are mapped
+    # straight to codes so strip().lower() runs once per distinct label.
+    code_of: Dict[str, int] = {}
+    raw_code: Dict[str, int] = {}
+    for raw in dict.fromkeys(raw_labels):
+        label = sys.intern(raw.strip().lower())
+        if label and label not in code_of:
+            code_of[label] = len(code_of)
+        raw_code[raw] = code_of.get(label, -1)
+    if not code_of:
+        return []
+    order = list(code_of)
+
+    try:
+        values = np.array(raw_values, dtype=np.float64)
+    except OverflowError as exc:
+        raise _FallBack("value out of float range") from exc
+    codes = np.fromiter(
+        map(raw_code.__getitem__, raw_labels), dtype=np.intp, count=len(raw_labels)
+    )
+    valid = codes >= 0
+    codes = codes[valid]
+    values = values[valid]
+
+    counts = np.bincount(codes, minlength=len(order))
+    scaled = values * 1024.0
+    if (
+        np.array_equal(scaled, np.floor(scaled))
+        and float(np.abs(scaled).max()) * values.size < 2.0 ** 53
+    ):
+        # Every value lies on a 1/1024 grid and the total is small, so the
+        # float64 sums are exact and a single division gives the same
+        # correctly rounded result as statistics.mean.
+        sums = np.bincount(codes, weights=values, minlength=len(order))
+        means = [float(s) / int(c) for s, c in zip(sums, counts)]
+    else:
+        means = [mean(values[codes == code].tolist()) for code in range(len(order))]
+
+    return [
+        {"Label": label, "Value": round(value, 2)}
+        for label, value in zip(order, means)
+    ]
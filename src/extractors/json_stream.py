@@ -0,0 +1,264 @@
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Tuple
+import json
+import logging
+import re
+
+LOGGER = logging.getLogger(__name__)
+
+REVIEW_KEYS: FrozenSet[str] = frozenset({"reviewBody", "reviewRating", "datePublished"})
+
+# Every review node owns a "reviewBody" key, so its occurrences anchor the search.
+# They are found with str.find, which is several times faster than a regex scan.
+_ANCHOR_KEY = "reviewBody"
+_ANCHOR_TOKEN = '"reviewBody"'
+_ANCHOR_COLON = re.compile(r"\s*:")
+
+# Text up to and including the next bracket that is not inside a string.
+# String contents are skipped by the regex engine, so Python only sees
+# brackets.
+_STRUCTURE_PATTERN = re.compile(
+    r'[^"{}\[\]]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"{}\[\]]*)*([{}\[\]])'
+)
+# Bracket-free text whose strings are all terminated.
+_TAIL_PATTERN = re.compile(r'[^"{}\[\]]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"{}\[\]]*)*')
+
+# A ten-character key containing a \u escape, which may spell reviewBody
+# without matching the anchor.
+_ESCAPED_KEY_PATTERN = re.compile(
+    r'"(?=[^"]{0,60}\\u)(?:[A-Za-z]|\\u00[0-9a-fA-F]{2}){10}"\s*:'
+)
+
+# Review objects are a few KB. A key further than this from the start of
+# its owner belongs to a page-level object, which a full decode handles
+# just as fast. It also caps the work spent on a key before giving up.
+MAX_OWNER_DISTANCE = 64 * 1024
+# The backward owner search starts this far before a key and quadruples.
+OWNER_SEARCH_SPAN = 1024
+
+_DECODER = json.JSONDecoder()
+
+
+def _is_escaped(text: str, pos: int) -> bool:
+    """
+    Whether the character at ``pos`` is preceded by an odd run of backslashes.
+    """
+    run = 0
+    while pos - run > 0 and text[pos - run - 1] == "\\":
+        run += 1
+    return run % 2 == 1
+
+
+def _count_quotes(segment: str) -> int:
+    """
+    Count unescaped quotes in a segment that does not start or end inside
+    an escape sequence.
+    """
+    if "\\" in segment:
+        segment = segment.replace("\\\\", "").replace('\\"', "")
+    return segment.count('"')
+
+
+def _has_escaped_anchor(text: str) -> bool:
+    if "\\u00" not in text:
+        return False
+    for match in _ESCAPED_KEY_PATTERN.finditer(text):
+        key = match.group(0)
+        if json.loads(key[: key.rindex('"') + 1]) == _ANCHOR_KEY:
+            return True
+    return False
+
+
+def _anchor_positions(text: str) -> Iterator[int]:
+    """
+    Offsets of ``"reviewBody"`` followed by a colon. Occurrences with an
+    escaped opening quote are included for the caller to skip.
+    """
+    pos = text.find(_ANCHOR_TOKEN)
+    while pos != -1:
+        if _ANCHOR_COLON.match(text, pos + len(_ANCHOR_TOKEN)):
+            yield pos
+        pos = text.find(_ANCHOR_TOKEN, pos + 1)
+
+
+def may_contain_review_nodes(text: str) -> bool:
+    """
+    Whether ``text`` has a review key, plain or written with ``\\u``
+    escapes. Without one no JSON blob in it can yield review nodes, so
+    pages rendered without review JSON can go straight to the HTML parser.
+    """
+    return _ANCHOR_KEY in text or _has_escaped_anchor(text)
+
+
+def find_review_nodes(
+    data: Any,
+    required_keys: FrozenSet[str] = REVIEW_KEYS,
+) -> List[Dict[str, Any]]:
+    """
+    Collect review-shaped objects from an already decoded JSON tree, in
+    the order a recursive walk visits them. This is the reference result
+    for ``decode_review_nodes`` and what callers fall back to.
+    """
+    collected: List[Dict[str, Any]] = []
+
+    def visit(node: Any) -> None:
+        if isinstance(node, dict):
+            if required_keys.issubset(node.keys()):
+                collected.append(node)
+            for value in node.values():
+                visit(value)
+        elif isinstance(node, list):
+            for item in node:
+                visit(item)
+
+    visit(data)
+    return collected
+
+
+def _decode_object_at(text: str, start: int) -> Optional[Tuple[Any, int]]:
+    """
+    Decode the JSON value starting at ``start``. Uses the scanner directly
+    because raw_decode's error path counts newlines over the whole document.
+    """
+    try:
+        return _DECODER.scan_once(text, start)
+    except (StopIteration, ValueError):
+        return None
+
+
+def _first_opener_outside_string(text: str, start: int, end: int) -> Optional[int]:
+    """
+    Offset of the first ``{`` in ``text[start:end]`` that lies outside a
+    string, given that ``end`` does. Returns None if there is none.
+    """
+    candidate = text.find("{", start, end)
+    if candidate == -1:
+        return None
+    quotes = _count_quotes(text[candidate + 1: end])
+    while quotes % 2:
+        following = text.find("{", candidate + 1, end)
+        if following == -1:
+            return None
+        quotes -= _count_quotes(text[candidate + 1: following])
+        candidate = following
+    return candidate
+
+
+def _scan_brackets(text: str, start: int, end: int) -> Optional[Tuple[List[int], int]]:
+    """
+    Scan ``text[start:end]``, which must start and end outside a string.
+    Returns the offsets of openers left unclosed within the range and the
+    number of closers that close openers before ``start``. Returns None if
+    the range does not end outside a string.
+    """
+    openers: List[int] = []
+    unmatched_closers = 0
+    pos = start
+    for match in iter(_STRUCTURE_PATTERN.scanner(text, start, end).match, None):
+        pos = match.end()
+        if match.group(1) in "{[":
+            openers.append(pos - 1)
+        elif openers:
+            openers.pop()
+        else:
+            unmatched_closers += 1
+    if _TAIL_PATTERN.fullmatch(text, pos, end) is None:
+        return None
+    return openers, unmatched_closers
+
+
+def decode_review_nodes(
+    text: str,
+    required_keys: FrozenSet[str] = REVIEW_KEYS,
+    max_owner_distance: int = MAX_OWNER_DISTANCE,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Decode only the review-shaped objects of a JSON document.
+
+    ``json.loads`` on a page-state blob builds every product, pricing and
+    recommendation object only for a handful of reviews to be picked out.
+    Instead, each ``"reviewBody":`` key is located with a C-level string
+    search. Such a key lies outside any string, so the brackets between
+    consecutive keys are tracked in one forward pass, with string contents
+    skipped inside the regex engine. The innermost open object at a key is
+    its owner, and only that object is decoded with the stdlib decoder.
+    When the first owner opens before the scanned range, the range is
+    extended backwards to an earlier ``{`` outside a string, over windows
+    that grow geometrically up to ``max_owner_distance``. A gap longer than
+    that between two keys is not scanned at all, since no owner across it
+    would be usable. Every character is scanned at most once, and
+    everything outside the review region is never turned into Python
+    objects.
+
+    Returns review nodes in document order, which is the order a recursive
+    walk of the fully decoded tree visits them. Returns None when an owner
+    cannot be found or decoded (malformed JSON), when a key is more than
+    ``max_owner_distance`` characters from the start of its owner, or when
+    a review key is written with ``\\u`` escapes. Callers should then fall
+    back to a full decode.
+    """
+    if _has_escaped_anchor(text):
+        LOGGER.debug("Review key written with escape sequences")
+        return None
+
+    # Known range [lo, hi): openers still open at hi, and closers in the
+    # range that close openers before lo.
+    lo = hi = -1
+    stack: List[int] = []
+    unmatched_closers = 0
+    nodes: Dict[int, Dict[str, Any]] = {}
+    decoded_owners = set()
+
+    for key_pos in _anchor_positions(text):
+        if _is_escaped(text, key_pos):
+            continue
+        if lo == -1 or key_pos - hi > max_owner_distance:
+            # An owner that opened before a gap this long is too far away,
+            # so start afresh at the key rather than scanning the gap.
+            lo = hi = key_pos
+            stack = []
+            unmatched_closers = 0
+
+        scanned = _scan_brackets(text, hi, key_pos)
+        if scanned is None:
+            return None
+        openers, closers = scanned
+        popped = min(closers, len(stack))
+        del stack[len(stack) - popped:]
+        unmatched_closers += closers - popped
+        stack.extend(openers)
+        hi = key_pos
+
+        limit = max(key_pos - max_owner_distance, 0)
+        span = OWNER_SEARCH_SPAN
+        while not stack:
+            floor = max(key_pos - span, limit)
+            candidate = _first_opener_outside_string(text, floor, lo)
+            if candidate is not None:
+                extended = _scan_brackets(text, candidate, lo)
+                if extended is None:
+                    return None
+                earlier, earlier_closers = extended
+                closed = min(unmatched_closers, len(earlier))
+                stack[:0] = earlier[: len(earlier) - closed]
+                unmatched_closers += earlier_closers - closed
+                lo = candidate
+            elif floor == limit:
+                LOGGER.debug("No object owns review key at offset %d", key_pos)
+                return None
+            span *= 4
+
+        start = stack[-1]
+        if text[start] != "{" or key_pos - start > max_owner_distance:
+            LOGGER.debug("Review key at offset %d has no usable owner", key_pos)
+            return None
+        if start in decoded_owners:
+            continue
+        decoded_owners.add(start)
+        decoded = _decode_object_at(text, start)
+        if decoded is None or decoded[1] <= key_pos:
+            LOGGER.debug("No decodable object owns review key at offset %d", key_pos)
+            return None
+        if required_keys.issubset(decoded[0].keys()):
+            nodes[start] = decoded[0]
+
+    return [nodes[start] for start in sorted(nodes)]
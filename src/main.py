@@ -1,15 +1,15 @@
 from outputs.json_exporter import JsonExporter
-from extractors.review_utils import (
-    parse_product_id_from_url,
-    build_product_summary,
-)
+from outputs.segment_store import SegmentStore
+from extractors.review_utils import parse_product_id_from_url
+from extractors.batch_normalise import build_product_summary_batch
 from extractors.target_parser import TargetReviewsScraper
+from scheduling.recrawl_scheduler import CrawlHistory, RecrawlScheduler
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 import sys
 import logging
 import json
-thonimport argparse
+import argparse
 
 
 LOGGER = logging.getLogger(__name__)
@@ -38,31 +38,36 @@ def load_settings(config_path: Optional[Path]) -> Dict[str, Any]:
         "max_reviews": None,
         "output_dir": "data",
         "output_prefix": "target_reviews_",
+        "recrawl_history_path": None,
+        "recrawl_max_age_days": 30,
+        "fetch_budget": None,
+        "output_format": "json",
+        "segment_size_bytes": 64 * 1024 * 1024,
     }
 
     if config_path is None:
-    LOGGER.info("No config path provided. Using default settings.")
-    return default_settings
+        LOGGER.info("No config path provided. Using default settings.")
+        return default_settings
 
     if not config_path.exists():
-    LOGGER.warning(
-        "Config file %s not found. Using default settings.", config_path
-    )
-    return default_settings
+        LOGGER.warning(
+            "Config file %s not found. Using default settings.", config_path
+        )
+        return default_settings
 
     try:
-    with config_path.open("r", encoding="utf-8") as f:
-    loaded = json.load(f)
-    if not isinstance(loaded, dict):
-    raise ValueError("Config root must be a JSON object")
-    merged = default_settings.copy()
-    merged.update(loaded)
-    LOGGER.info("Loaded configuration from %s", config_path)
-    return merged
+        with config_path.open("r", encoding="utf-8") as f:
+            loaded = json.load(f)
+        if not isinstance(loaded, dict):
+            raise ValueError("Config root must be a JSON object")
+        merged = default_settings.copy()
+        merged.update(loaded)
+        LOGGER.info("Loaded configuration from %s", config_path)
+        return merged
     except Exception as exc:
-    LOGGER.error("Failed to load config from %s: %s", config_path, exc)
-    LOGGER.info("Falling back to default settings.")
-    return default_settings
+        LOGGER.error("Failed to load config from %s: %s", config_path, exc)
+        LOGGER.info("Falling back to default settings.")
+        return default_settings
 
 
 def read_urls_from_file(path: Path) -> List[str]:
@@ -71,22 +76,47 @@ def read_urls_from_file(path: Path) -> List[str]:
     Empty lines and comments starting with '#' are ignored.
     """
     if not path.exists():
-    raise FileNotFoundError(f"Input file not found: {path}")
+        raise FileNotFoundError(f"Input file not found: {path}")
 
     urls: List[str] = []
     with path.open("r", encoding="utf-8") as f:
-    for line in f:
-    line = line.strip()
-    if not line or line.startswith("#"):
-    continue
-    urls.append(line)
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            urls.append(line)
 
     if not urls:
-    raise ValueError(f"No URLs found in input file: {path}")
+        raise ValueError(f"No URLs found in input file: {path}")
 
     return urls
 
 
+def plan_recrawl(
+    urls: List[str],
+    history: CrawlHistory,
+    fetch_budget: Optional[int],
+    max_age_days: Optional[float],
+) -> List[str]:
+    """
+    Order URLs by expected review change and keep at most fetch_budget of
+    them. URLs without a parseable product ID are passed through untouched
+    so they are reported by the normal error path.
+    """
+    products = []
+    passthrough: List[str] = []
+    for url in urls:
+        try:
+            products.append((parse_product_id_from_url(url), url))
+        except ValueError:
+            passthrough.append(url)
+
+    scheduler = RecrawlScheduler(history, max_age_days=max_age_days)
+    plan = scheduler.plan(products, fetch_budget=fetch_budget)
+    LOGGER.info("Recrawl plan: %s", plan.to_report())
+    return plan.urls + passthrough
+
+
 def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Scrape product reviews from Target.com and export to JSON."
@@ -109,6 +139,12 @@ def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
         help="Directory to store output JSON files "
         "(overrides config setting if provided)",
     )
+    parser.add_argument(
+        "--fetch-budget",
+        type=int,
+        help="Maximum number of products to fetch, prioritised by review "
+        "velocity (requires recrawl_history_path in the config)",
+    )
     parser.add_argument(
         "-v",
         "--verbose",
@@ -138,68 +174,130 @@ def main(argv: Optional[List[str]] = None) -> int:
 
     exporter = JsonExporter(base_dir=output_dir,
                             prefix=settings.get("output_prefix"))
+    segment_store: Optional[SegmentStore] = None
+    if settings.get("output_format") == "segments":
+        try:
+            segment_store = SegmentStore(
+                base_dir=output_dir / "segments",
+                segment_size_bytes=settings.get("segment_size_bytes", 64 * 1024 * 1024),
+            )
+        except RuntimeError as exc:
+            LOGGER.error("Cannot open segment store: %s", exc)
+            return 1
+
     scraper = TargetReviewsScraper(
         user_agent=settings.get("user_agent"),
         timeout=settings.get("request_timeout", 10),
     )
 
     if args.urls:
-    urls = args.urls
+        urls = args.urls
     else:
-    sample_input = project_root / "data" / "sample_input.txt"
-    LOGGER.info("No URLs provided. Reading from %s", sample_input)
-    urls = read_urls_from_file(sample_input)
+        sample_input = project_root / "data" / "sample_input.txt"
+        LOGGER.info("No URLs provided. Reading from %s", sample_input)
+        urls = read_urls_from_file(sample_input)
+
+    crawl_history: Optional[CrawlHistory] = None
+    if settings.get("recrawl_history_path"):
+        crawl_history = CrawlHistory(project_root / settings["recrawl_history_path"])
+        try:
+            crawl_history.load()
+        except Exception as exc:
+            LOGGER.error("Failed to load crawl history: %s. Starting fresh.", exc)
+            crawl_history.products.clear()
+
+        fetch_budget = (
+            args.fetch_budget
+            if args.fetch_budget is not None
+            else settings.get("fetch_budget")
+        )
+        urls = plan_recrawl(
+            urls,
+            history=crawl_history,
+            fetch_budget=fetch_budget,
+            max_age_days=settings.get("recrawl_max_age_days"),
+        )
+    elif args.fetch_budget is not None:
+        LOGGER.warning(
+            "--fetch-budget ignored: no recrawl_history_path configured.")
 
     overall_success = True
 
     for url in urls:
-    LOGGER.info("Processing product URL: %s", url)
-    try:
-    product_id = parse_product_id_from_url(url)
-    except ValueError as exc:
-    LOGGER.error("Failed to extract product ID from URL '%s': %s", url, exc)
-    overall_success = False
-    continue
-
-    try:
-    reviews = scraper.fetch_reviews_for_product(
-        product_url=url,
-        product_id=product_id,
-        max_reviews=settings.get("max_reviews"),
-    )
-    except Exception as exc:
-    LOGGER.exception(
-        "Failed to fetch reviews for product %s (%s): %s",
-        product_id,
-        url,
-        exc,
-    )
-    overall_success = False
-    continue
-
-    if not reviews:
-    LOGGER.warning(
-        "No reviews found for product %s (%s). Skipping export.",
-        product_id,
-        url,
-    )
-    continue
-
-    summary = build_product_summary(
-        product_url=url,
-        product_id=product_id,
-        reviews=reviews,
-    )
-
-    combined: List[Dict[str, Any]] = [summary] + reviews
-    output_path = exporter.generate_output_path(product_id=product_id)
-
-    try:
-    exporter.write_reviews_to_file(combined, output_path)
-    LOGGER.info("Exported %d records to %s", len(combined), output_path)
-    except Exception as exc:
-    LOGGER.exception("Failed to export reviews for %s: %s", product_id, exc)
-    overall_success = False
+        LOGGER.info("Processing product URL: %s", url)
+        try:
+            product_id = parse_product_id_from_url(url)
+        except ValueError as exc:
+            LOGGER.error("Failed to extract product ID from URL '%s': %s", url, exc)
+            overall_success = False
+            continue
+
+        try:
+            reviews = scraper.fetch_reviews_for_product(
+                product_url=url,
+                product_id=product_id,
+                max_reviews=settings.get("max_reviews"),
+            )
+        except Exception as exc:
+            LOGGER.exception(
+                "Failed to fetch reviews for product %s (%s): %s",
+                product_id,
+                url,
+                exc,
+            )
+            overall_success = False
+            continue
+
+        if crawl_history is not None:
+            crawl_history.record_crawl(
+                product_id=product_id,
+                product_url=url,
+                review_count=len(reviews),
+                submitted_dates=[r.get("Submitted Date") for r in reviews],
+            )
+
+        if not reviews:
+            LOGGER.warning(
+                "No reviews found for product %s (%s). Skipping export.",
+                product_id,
+                url,
+            )
+            continue
+
+        summary = build_product_summary_batch(
+            product_url=url,
+            product_id=product_id,
+            reviews=reviews,
+        )
+
+        if segment_store is not None:
+            try:
+                written = segment_store.write_product(product_id, summary, reviews)
+                LOGGER.info("Appended %d records for %s to %s",
+                            written, product_id, segment_store.base_dir)
+            except Exception as exc:
+                LOGGER.exception("Failed to export reviews for %s: %s", product_id, exc)
+                overall_success = False
+            continue
+
+        combined: List[Dict[str, Any]] = [summary] + reviews
+        output_path = exporter.generate_output_path(product_id=product_id)
+
+        try:
+            exporter.write_reviews_to_file(combined, output_path)
+            LOGGER.info("Exported %d records to %s", len(combined), output_path)
+        except Exception as exc:
+            LOGGER.exception("Failed to export reviews for %s: %s", product_id, exc)
+            overall_success = False
+
+    if segment_store is not None:
+        segment_store.close()
+
+    if crawl_history is not None:
+        try:
+            crawl_history.save()
+        except Exception as exc:
+            LOGGER.warning("Failed to save crawl history: %s", exc)
 
     return 0 if overall_success else 1
 
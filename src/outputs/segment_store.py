@@ -0,0 +1,529 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from dataclasses import dataclass
+from pathlib import Path
+import argparse
+import json
+import logging
+import mmap
+import os
+import re
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+LOGGER = logging.getLogger(__name__)
+
+SEGMENT_PATTERN = re.compile(r"^segment-(\d{6})\.jsonl$")
+INDEX_FILENAME = "index.tsv"
+LOCK_FILENAME = "store.lock"
+SUMMARY_REVIEW_ID = "__summary__"
+
+
+@dataclass(frozen=True)
+class RecordLocation:
+    segment: int
+    offset: int
+    length: int
+
+
+def _segment_name(segment: int) -> str:
+    return f"segment-{segment:06d}.jsonl"
+
+
+def _escape_key(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+def _unescape_key(value: str) -> str:
+    return re.sub(
+        r"\\(.)",
+        lambda m: {"t": "\t", "n": "\n"}.get(m.group(1), m.group(1)),
+        value,
+    )
+
+
+def _index_line(
+    product_id: str, review_id: str, generation: int, location: RecordLocation
+) -> str:
+    return (
+        f"{_escape_key(product_id)}\t{_escape_key(review_id)}\t{generation}\t"
+        f"{location.segment}\t{location.offset}\t{location.length}\n"
+    )
+
+
+class SegmentStore:
+    """
+    Append-only review store made of rolling segment files.
+
+    Each record is one JSON line in ``segment-NNNNNN.jsonl``. A new segment
+    is started once the current one reaches ``segment_size_bytes``.
+    ``index.tsv`` maps (product ID, review ID) to a product generation,
+    segment, offset and length. It is append-only too, so later entries
+    supersede earlier ones when it is loaded. Each ``write_product`` starts
+    a new generation of its product, so reviews missing from a re-scrape
+    are dropped along with the rest of the older generation. Product
+    summaries are stored under the review ID ``__summary__``.
+
+    Only one writer may have a store open. A writable store holds an
+    exclusive lock on ``store.lock`` until it is closed, and opening a
+    second one fails. ``read_only`` stores take no lock and never modify
+    the store. On platforms without ``fcntl`` single-writer use is up to
+    the caller.
+    """
+
+    def __init__(
+        self,
+        base_dir: Path,
+        segment_size_bytes: int = 64 * 1024 * 1024,
+        fsync: bool = True,
+        read_only: bool = False,
+    ) -> None:
+        self.base_dir = Path(base_dir)
+        self.segment_size_bytes = segment_size_bytes
+        self.fsync = fsync
+        self.read_only = read_only
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+
+        self._index: Dict[str, Dict[str, RecordLocation]] = {}
+        self._generations: Dict[str, int] = {}
+        self._segment_file: Optional[Any] = None
+        self._index_file: Optional[Any] = None
+        self._current_segment = 0
+        self._current_size = 0
+        self._maps: Dict[int, Tuple[Any, mmap.mmap]] = {}
+        self._lock_file: Optional[Any] = None
+
+        if not read_only:
+            self._acquire_lock()
+        try:
+            self._load_index()
+        except Exception:
+            self._release_lock()
+            raise
+        segments = self.segment_numbers()
+        if segments:
+            self._current_segment = segments[-1]
+            self._current_size = self._segment_path(self._current_segment).stat().st_size
+        else:
+            self._current_segment = 1
+            self._current_size = 0
+        LOGGER.debug(
+            "SegmentStore opened at %s with %d indexed records",
+            self.base_dir,
+            len(self),
+        )
+
+    # -------------------------------------------------------------------------
+    # Paths and index
+    # -------------------------------------------------------------------------
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.base_dir / _segment_name(segment)
+
+    @property
+    def index_path(self) -> Path:
+        return self.base_dir / INDEX_FILENAME
+
+    def _acquire_lock(self) -> None:
+        if fcntl is None:
+            return
+        lock_file = (self.base_dir / LOCK_FILENAME).open("a+b")
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            raise RuntimeError(
+                f"Segment store {self.base_dir} is already open for writing"
+            ) from None
+        self._lock_file = lock_file
+
+    def _release_lock(self) -> None:
+        if self._lock_file is not None:
+            # Closing the file releases the lock
+            self._lock_file.close()
+            self._lock_file = None
+
+    def segment_numbers(self) -> List[int]:
+        numbers = []
+        for path in self.base_dir.iterdir():
+            match = SEGMENT_PATTERN.match(path.name)
+            if match:
+                numbers.append(int(match.group(1)))
+        return sorted(numbers)
+
+    def _load_index(self) -> None:
+        """
+        Load ``index.tsv``. A torn final line from an interrupted write is
+        truncated away, so the next append starts on a fresh line, and any
+        other unparseable line is skipped. Read-only stores only skip the
+        torn line.
+        """
+        if not self.index_path.exists():
+            return
+        complete_bytes = 0
+        with self.index_path.open("rb") as f:
+            for line_no, raw in enumerate(f, start=1):
+                if not raw.endswith(b"\n"):
+                    break
+                complete_bytes += len(raw)
+                try:
+                    self._load_index_line(raw.decode("utf-8"))
+                except ValueError as exc:
+                    LOGGER.warning(
+                        "Ignoring malformed index line %d in %s: %s",
+                        line_no,
+                        self.index_path,
+                        exc,
+                    )
+
+        if not self.read_only and self.index_path.stat().st_size > complete_bytes:
+            LOGGER.warning(
+                "Truncating torn final line of %s at byte %d",
+                self.index_path,
+                complete_bytes,
+            )
+            with self.index_path.open("r+b") as f:
+                f.truncate(complete_bytes)
+
+    def _load_index_line(self, line: str) -> None:
+        parts = line.rstrip("\n").split("\t")
+        if len(parts) == 6:
+            product_id, review_id, generation, segment, offset, length = parts
+        elif len(parts) == 5:
+            # Written before product generations existed
+            product_id, review_id, segment, offset, length = parts
+            generation = "0"
+        else:
+            raise ValueError(f"expected 6 fields, got {len(parts)}")
+        location = RecordLocation(int(segment), int(offset), int(length))
+        product_id = _unescape_key(product_id)
+        gen = int(generation)
+
+        current = self._generations.get(product_id)
+        if current is None or gen > current:
+            self._generations[product_id] = gen
+            self._index[product_id] = {}
+        elif gen < current:
+            return
+        self._index[product_id][_unescape_key(review_id)] = location
+
+    def __len__(self) -> int:
+        return sum(len(records) for records in self._index.values())
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        product_id, review_id = key
+        return review_id in self._index.get(product_id, {})
+
+    def keys(self) -> Iterator[Tuple[str, str]]:
+        return iter([
+            (product_id, review_id)
+            for product_id, records in self._index.items()
+            for review_id in records
+        ])
+
+    def review_ids(self, product_id: str) -> List[str]:
+        return list(self._index.get(product_id, {}))
+
+    # -------------------------------------------------------------------------
+    # Writing
+    # -------------------------------------------------------------------------
+
+    def _check_writable(self) -> None:
+        if self.read_only:
+            raise RuntimeError(f"Segment store {self.base_dir} is open read-only")
+
+    def _open_for_append(self) -> None:
+        self._check_writable()
+        if self._segment_file is None:
+            self._segment_file = self._segment_path(self._current_segment).open("ab")
+        if self._index_file is None:
+            self._index_file = self.index_path.open("a", encoding="utf-8")
+
+    def _roll_segment(self) -> None:
+        self.sync()
+        self._close_segment()
+        self._current_segment += 1
+        self._current_size = 0
+        LOGGER.debug("Rolled to segment %s", _segment_name(self._current_segment))
+
+    def _close_segment(self) -> None:
+        if self._segment_file is not None:
+            self._segment_file.close()
+            self._segment_file = None
+        self._release_map(self._current_segment)
+
+    def append(self, product_id: str, review_id: str, record: Dict[str, Any]) -> RecordLocation:
+        """
+        Append one record to the product's current generation. A record
+        already stored under the same key is superseded and dropped by the
+        next compaction.
+        """
+        payload = json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+        if self._current_size and self._current_size + len(payload) > self.segment_size_bytes:
+            self._roll_segment()
+        self._open_for_append()
+
+        location = RecordLocation(self._current_segment, self._current_size, len(payload))
+        self._segment_file.write(payload)
+        self._current_size += len(payload)
+
+        generation = self._generations.setdefault(product_id, 0)
+        self._index_file.write(_index_line(product_id, review_id, generation, location))
+        self._index.setdefault(product_id, {})[review_id] = location
+        self._release_map(location.segment)
+        return location
+
+    def write_product(
+        self,
+        product_id: str,
+        summary: Optional[Dict[str, Any]],
+        reviews: Iterable[Dict[str, Any]],
+    ) -> int:
+        """
+        Append a product summary and its reviews as a new generation of the
+        product and flush them to the OS. Every earlier record of the
+        product is superseded, including reviews the new scrape no longer
+        contains. Writing neither a summary nor reviews leaves the stored
+        generation untouched. Returns the number of records written.
+        """
+        reviews = list(reviews)
+        if summary is None and not reviews:
+            return 0
+        self._check_writable()
+        self._generations[product_id] = self._generations.get(product_id, 0) + 1
+        self._index[product_id] = {}
+        written = 0
+        if summary is not None:
+            self.append(product_id, SUMMARY_REVIEW_ID, summary)
+            written += 1
+        for idx, review in enumerate(reviews, start=1):
+            review_id = str(review.get("Review ID") or f"index-{idx}")
+            self.append(product_id, review_id, review)
+            written += 1
+        self.flush()
+        return written
+
+    def flush(self) -> None:
+        """
+        Hand buffered writes to the OS. Segment data goes first so the index
+        never points at bytes that were not written.
+        """
+        if self._segment_file is not None:
+            self._segment_file.flush()
+        if self._index_file is not None:
+            self._index_file.flush()
+
+    def sync(self) -> None:
+        """
+        Flush and, if enabled, fsync the open segment and the index. This
+        only happens when a segment rolls over or the store is closed,
+        rather than once per product file.
+        """
+        self.flush()
+        if not self.fsync:
+            return
+        if self._segment_file is not None:
+            os.fsync(self._segment_file.fileno())
+        if self._index_file is not None:
+            os.fsync(self._index_file.fileno())
+
+    def close(self) -> None:
+        self.sync()
+        self._close_segment()
+        if self._index_file is not None:
+            self._index_file.close()
+            self._index_file = None
+        for segment in list(self._maps):
+            self._release_map(segment)
+        self._release_lock()
+
+    def __enter__(self) -> "SegmentStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # -------------------------------------------------------------------------
+    # Reading
+    # -------------------------------------------------------------------------
+
+    def _map_segment(self, segment: int) -> mmap.mmap:
+        cached = self._maps.get(segment)
+        if cached is not None:
+            return cached[1]
+        f = self._segment_path(segment).open("rb")
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            f.close()
+            raise
+        self._maps[segment] = (f, mapped)
+        return mapped
+
+    def _release_map(self, segment: int) -> None:
+        cached = self._maps.pop(segment, None)
+        if cached is not None:
+            f, mapped = cached
+            mapped.close()
+            f.close()
+
+    def get(self, product_id: str, review_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a single record through a memory map of its segment without
+        reading the rest of the segment.
+        """
+        location = self._index.get(product_id, {}).get(review_id)
+        if location is None:
+            return None
+        if location.segment == self._current_segment and self._segment_file is not None:
+            self._segment_file.flush()
+        mapped = self._map_segment(location.segment)
+        raw = mapped[location.offset: location.offset + location.length]
+        return json.loads(raw.decode("utf-8"))
+
+    def iter_product(self, product_id: str) -> Iterator[Dict[str, Any]]:
+        for review_id in self.review_ids(product_id):
+            record = self.get(product_id, review_id)
+            if record is not None:
+                yield record
+
+    # -------------------------------------------------------------------------
+    # Compaction
+    # -------------------------------------------------------------------------
+
+    def compact(self) -> Dict[str, int]:
+        """
+        Rewrite live records into fresh segments and drop superseded ones.
+
+        New segments are numbered after the existing ones and the new index
+        is swapped in atomically before old segments are deleted, so an
+        interrupted compaction leaves a readable store.
+        """
+        self._check_writable()
+        self.sync()
+        self._close_segment()
+        if self._index_file is not None:
+            self._index_file.close()
+            self._index_file = None
+
+        old_segments = self.segment_numbers()
+        old_bytes = sum(self._segment_path(n).stat().st_size for n in old_segments)
+        live = sorted(
+            (
+                ((product_id, review_id), location)
+                for product_id, records in self._index.items()
+                for review_id, location in records.items()
+            ),
+            key=lambda item: (item[1].segment, item[1].offset),
+        )
+
+        next_segment = (old_segments[-1] + 1) if old_segments else 1
+        new_index: Dict[str, Dict[str, RecordLocation]] = {}
+        new_segments: List[int] = []
+        out = None
+        size = 0
+        segment = next_segment
+        try:
+            for key, location in live:
+                mapped = self._map_segment(location.segment)
+                payload = mapped[location.offset: location.offset + location.length]
+                if out is None or (size and size + len(payload) > self.segment_size_bytes):
+                    if out is not None:
+                        out.flush()
+                        os.fsync(out.fileno())
+                        out.close()
+                        segment += 1
+                    out = self._segment_path(segment).open("wb")
+                    new_segments.append(segment)
+                    size = 0
+                out.write(payload)
+                new_index.setdefault(key[0], {})[key[1]] = RecordLocation(
+                    segment, size, len(payload)
+                )
+                size += len(payload)
+        finally:
+            if out is not None:
+                out.flush()
+                os.fsync(out.fileno())
+                out.close()
+            for number in list(self._maps):
+                self._release_map(number)
+
+        tmp_index = self.index_path.with_suffix(".tsv.tmp")
+        with tmp_index.open("w", encoding="utf-8") as f:
+            for product_id, records in new_index.items():
+                generation = self._generations.get(product_id, 0)
+                for review_id, location in records.items():
+                    f.write(_index_line(product_id, review_id, generation, location))
+            f.flush()
+            os.fsync(f.fileno())
+        tmp_index.replace(self.index_path)
+
+        for number in old_segments:
+            self._segment_path(number).unlink()
+
+        self._index = new_index
+        if new_segments:
+            self._current_segment = new_segments[-1]
+            self._current_size = size
+        else:
+            self._current_segment = next_segment
+            self._current_size = 0
+
+        new_bytes = sum(self._segment_path(n).stat().st_size for n in new_segments)
+        stats = {
+            "Live Records": sum(len(records) for records in new_index.values()),
+            "Segments Before": len(old_segments),
+            "Segments After": len(new_segments),
+            "Bytes Before": old_bytes,
+            "Bytes After": new_bytes,
+        }
+        LOGGER.info("Compacted segment store %s: %s", self.base_dir, stats)
+        return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Inspect or compact a segmented review store."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    compact_cmd = sub.add_parser("compact", help="Drop superseded records")
+    compact_cmd.add_argument("store_dir")
+    compact_cmd.add_argument(
+        "--segment-size", type=int, default=64 * 1024 * 1024,
+        help="Target segment size in bytes for the rewritten segments",
+    )
+
+    get_cmd = sub.add_parser("get", help="Print a single record")
+    get_cmd.add_argument("store_dir")
+    get_cmd.add_argument("product_id")
+    get_cmd.add_argument(
+        "review_id", nargs="?", default=SUMMARY_REVIEW_ID,
+        help="Review ID (defaults to the product summary)",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
+    )
+
+    if args.command == "compact":
+        with SegmentStore(Path(args.store_dir), segment_size_bytes=args.segment_size) as store:
+            print(json.dumps(store.compact(), indent=2))
+        return 0
+
+    with SegmentStore(Path(args.store_dir), read_only=True) as store:
+        record = store.get(args.product_id, args.review_id)
+    if record is None:
+        LOGGER.error("No record for product %s review %s", args.product_id, args.review_id)
+        return 1
+    print(json.dumps(record, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
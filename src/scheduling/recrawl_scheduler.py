@@ -0,0 +1,410 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+import argparse
+import json
+import logging
+import math
+
+LOGGER = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400.0
+
+
+def parse_review_date(value: Any) -> Optional[datetime]:
+    """
+    Parse a review 'Submitted Date' such as 2025-08-03T21:56:08.000+00:00.
+    Naive timestamps are treated as UTC. Returns None if unparseable.
+    """
+    if not isinstance(value, str) or not value.strip():
+        return None
+    text = value.strip()
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _days_between(start: datetime, end: datetime) -> float:
+    return max((end - start).total_seconds() / SECONDS_PER_DAY, 0.0)
+
+
+@dataclass
+class CrawlObservation:
+    crawled_at: datetime
+    review_count: int
+    newest_review: Optional[datetime] = None
+    oldest_review: Optional[datetime] = None
+    # Reviews dated after the newest review of the previous crawl that
+    # returned any. None when either crawl had no parseable dates.
+    new_reviews: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "Crawled At": self.crawled_at.isoformat(),
+            "Review Count": self.review_count,
+            "Newest Review": self.newest_review.isoformat() if self.newest_review else None,
+            "Oldest Review": self.oldest_review.isoformat() if self.oldest_review else None,
+            "New Reviews": self.new_reviews,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CrawlObservation":
+        crawled_at = parse_review_date(data.get("Crawled At"))
+        if crawled_at is None:
+            raise ValueError(f"Invalid crawl timestamp: {data.get('Crawled At')!r}")
+        return cls(
+            crawled_at=crawled_at,
+            review_count=int(data.get("Review Count") or 0),
+            newest_review=parse_review_date(data.get("Newest Review")),
+            oldest_review=parse_review_date(data.get("Oldest Review")),
+            new_reviews=(
+                int(data["New Reviews"])
+                if data.get("New Reviews") is not None
+                else None
+            ),
+        )
+
+
+@dataclass
+class ProductHistory:
+    product_id: str
+    product_url: str
+    observations: List[CrawlObservation] = field(default_factory=list)
+
+    @property
+    def last_crawled(self) -> Optional[datetime]:
+        return self.observations[-1].crawled_at if self.observations else None
+
+    def review_rate(self, prior_days: float = 7.0) -> float:
+        """
+        Estimate the review arrival rate in reviews per day.
+
+        The lifetime rate implied by the review dates of the latest crawl
+        acts as a prior worth ``prior_days`` days of observation. It is
+        updated with the reviews actually gained between crawls: those dated
+        after the previous crawl's newest review. The review count is capped
+        by max_reviews and the page's review window, so count differences
+        are only used when a crawl has no review dates. Time since
+        the newest review counts as an observed quiet period, so dormant
+        products decay towards zero. Crawls that returned no reviews saw
+        nothing and are left out.
+        """
+        observed = [obs for obs in self.observations if obs.review_count > 0]
+        if not observed:
+            return 0.0
+
+        latest = observed[-1]
+        prior_rate = 0.0
+        if latest.oldest_review is not None and latest.review_count > 0:
+            lifetime = _days_between(latest.oldest_review, latest.crawled_at)
+            prior_rate = latest.review_count / max(lifetime, 1.0)
+
+        gained = 0
+        elapsed = 0.0
+        for previous, current in zip(observed, observed[1:]):
+            if current.new_reviews is not None:
+                gained += current.new_reviews
+            else:
+                gained += max(current.review_count - previous.review_count, 0)
+            elapsed += _days_between(previous.crawled_at, current.crawled_at)
+
+        if latest.newest_review is not None:
+            quiet = _days_between(latest.newest_review, latest.crawled_at)
+            elapsed = max(elapsed, quiet)
+
+        return (prior_rate * prior_days + gained) / (prior_days + elapsed)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "Product URL": self.product_url,
+            "Observations": [obs.to_dict() for obs in self.observations],
+        }
+
+
+class CrawlHistory:
+    """
+    Per-product crawl observations persisted as a JSON file.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_observations: int = 20) -> None:
+        self.path = Path(path) if path else None
+        self.max_observations = max_observations
+        self.products: Dict[str, ProductHistory] = {}
+
+    def load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        with self.path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError("Crawl history root must be a JSON object")
+
+        for product_id, entry in data.items():
+            observations: List[CrawlObservation] = []
+            for raw in entry.get("Observations") or []:
+                try:
+                    observations.append(CrawlObservation.from_dict(raw))
+                except Exception as exc:  # noqa: BLE001
+                    LOGGER.debug(
+                        "Skipping bad observation for product %s: %s", product_id, exc
+                    )
+            self.products[str(product_id)] = ProductHistory(
+                product_id=str(product_id),
+                product_url=entry.get("Product URL") or "",
+                observations=observations,
+            )
+        LOGGER.info("Loaded crawl history for %d products from %s",
+                    len(self.products), self.path)
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        data = {pid: history.to_dict() for pid, history in self.products.items()}
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        tmp_path.replace(self.path)
+
+    def record_crawl(
+        self,
+        product_id: str,
+        product_url: str,
+        review_count: int,
+        submitted_dates: Iterable[Any] = (),
+        crawled_at: Optional[datetime] = None,
+    ) -> None:
+        """
+        Record one crawl of a product, typically the 'Review Count' of the
+        product summary plus the 'Submitted Date' of each review.
+        """
+        dates = [d for d in (parse_review_date(v) for v in submitted_dates) if d]
+        history = self.products.setdefault(
+            product_id, ProductHistory(product_id=product_id, product_url=product_url)
+        )
+        previous = next(
+            (obs for obs in reversed(history.observations) if obs.review_count > 0),
+            None,
+        )
+        new_reviews: Optional[int] = None
+        if dates and previous is not None and previous.newest_review is not None:
+            new_reviews = sum(1 for d in dates if d > previous.newest_review)
+
+        observation = CrawlObservation(
+            crawled_at=crawled_at or datetime.now(timezone.utc),
+            review_count=int(review_count),
+            newest_review=max(dates) if dates else None,
+            oldest_review=min(dates) if dates else None,
+            new_reviews=new_reviews,
+        )
+        history.product_url = product_url
+        history.observations.append(observation)
+        del history.observations[: -self.max_observations]
+
+
+@dataclass
+class PlannedCrawl:
+    product_id: str
+    product_url: str
+    rate_per_day: float
+    age_days: Optional[float]
+    change_probability: float
+    forced: bool = False
+
+    @property
+    def expected_new_reviews(self) -> float:
+        if self.age_days is None:
+            return float("inf")
+        return self.rate_per_day * self.age_days
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "Product ID": self.product_id,
+            "Product URL": self.product_url,
+            "Reviews Per Day": round(self.rate_per_day, 4),
+            "Age Days": round(self.age_days, 2) if self.age_days is not None else None,
+            "Change Probability": round(self.change_probability, 4),
+            "Forced": self.forced,
+        }
+
+
+@dataclass
+class CrawlPlan:
+    selected: List[PlannedCrawl]
+    skipped: List[PlannedCrawl]
+
+    @property
+    def urls(self) -> List[str]:
+        return [item.product_url for item in self.selected]
+
+    def expected_freshness(self) -> float:
+        """
+        Expected fraction of products whose stored reviews are up to date
+        once the plan has run: crawled products are fresh, skipped ones
+        are fresh with probability exp(-rate * age).
+        """
+        total = len(self.selected) + len(self.skipped)
+        if total == 0:
+            return 1.0
+        fresh = len(self.selected) + sum(
+            1.0 - item.change_probability for item in self.skipped
+        )
+        return fresh / total
+
+    def to_report(self) -> Dict[str, Any]:
+        ordered = self.selected + self.skipped
+        curve: List[Dict[str, Any]] = []
+        for fraction in (0.25, 0.5, 0.75, 1.0):
+            budget = int(math.ceil(len(ordered) * fraction))
+            partial = CrawlPlan(selected=ordered[:budget], skipped=ordered[budget:])
+            curve.append(
+                {
+                    "Fetches": budget,
+                    "Expected Freshness": round(partial.expected_freshness(), 4),
+                }
+            )
+        missed = sum(
+            item.expected_new_reviews
+            for item in self.skipped
+            if item.age_days is not None
+        )
+        return {
+            "Candidates": len(ordered),
+            "Fetches": len(self.selected),
+            "Forced": sum(1 for item in self.selected if item.forced),
+            "Expected Freshness": round(self.expected_freshness(), 4),
+            "Expected Missed Reviews": round(missed, 2),
+            "Freshness By Fetches": curve,
+        }
+
+
+class RecrawlScheduler:
+    """
+    Builds a prioritised crawl plan from each product's review velocity.
+
+    Products are ranked by the probability that they gained a review since
+    their last crawl, assuming Poisson arrivals at the estimated rate.
+    Products never crawled before, or not crawled for ``max_age_days``,
+    are always included first.
+    """
+
+    def __init__(
+        self,
+        history: CrawlHistory,
+        max_age_days: Optional[float] = 30.0,
+        prior_days: float = 7.0,
+    ) -> None:
+        self.history = history
+        self.max_age_days = max_age_days
+        self.prior_days = prior_days
+
+    def _assess(
+        self,
+        product_id: str,
+        product_url: str,
+        now: datetime,
+    ) -> PlannedCrawl:
+        history = self.history.products.get(product_id)
+        if history is None or history.last_crawled is None:
+            return PlannedCrawl(
+                product_id=product_id,
+                product_url=product_url,
+                rate_per_day=0.0,
+                age_days=None,
+                change_probability=1.0,
+                forced=True,
+            )
+
+        rate = history.review_rate(prior_days=self.prior_days)
+        age = _days_between(history.last_crawled, now)
+        forced = self.max_age_days is not None and age >= self.max_age_days
+        return PlannedCrawl(
+            product_id=product_id,
+            product_url=product_url,
+            rate_per_day=rate,
+            age_days=age,
+            change_probability=1.0 - math.exp(-rate * age),
+            forced=forced,
+        )
+
+    def plan(
+        self,
+        products: Iterable[Tuple[str, str]],
+        fetch_budget: Optional[int] = None,
+        now: Optional[datetime] = None,
+    ) -> CrawlPlan:
+        """
+        Plan a crawl over ``(product_id, product_url)`` pairs spending at
+        most ``fetch_budget`` fetches (all products if None). Forced
+        products count against the budget too.
+        """
+        now = now or datetime.now(timezone.utc)
+        assessed = [self._assess(pid, url, now) for pid, url in products]
+        assessed.sort(
+            key=lambda item: (item.forced, item.change_probability, item.rate_per_day),
+            reverse=True,
+        )
+
+        if fetch_budget is None:
+            budget = len(assessed)
+        else:
+            budget = max(int(fetch_budget), 0)
+        selected = assessed[:budget]
+        skipped = assessed[budget:]
+
+        forced_skipped = sum(1 for item in skipped if item.forced)
+        if forced_skipped:
+            LOGGER.warning(
+                "Fetch budget of %d leaves %d new or overdue products uncrawled",
+                budget,
+                forced_skipped,
+            )
+        return CrawlPlan(selected=selected, skipped=skipped)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Print a crawl plan for the URLs in a file without crawling anything.
+    """
+    from extractors.review_utils import parse_product_id_from_url
+
+    parser = argparse.ArgumentParser(
+        description="Plan a review recrawl from crawl history."
+    )
+    parser.add_argument("input", help="Text file with product URLs, one per line")
+    parser.add_argument("--history", required=True, help="Crawl history JSON file")
+    parser.add_argument("--fetch-budget", type=int, default=None)
+    parser.add_argument("--max-age-days", type=float, default=30.0)
+    args = parser.parse_args(argv)
+
+    products: List[Tuple[str, str]] = []
+    with open(args.input, "r", encoding="utf-8") as f:
+        for line in f:
+            url = line.strip()
+            if not url or url.startswith("#"):
+                continue
+            try:
+                products.append((parse_product_id_from_url(url), url))
+            except ValueError as exc:
+                LOGGER.error("%s", exc)
+
+    history = CrawlHistory(Path(args.history))
+    history.load()
+    plan = RecrawlScheduler(history, max_age_days=args.max_age_days).plan(
+        products, fetch_budget=args.fetch_budget
+    )
+    report = plan.to_report()
+    report["Plan"] = [item.to_dict() for item in plan.selected]
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,151 @@
+import copy
+import gc
+import random
+import threading
+
+import pytest
+
+from extractors import batch_normalise
+from extractors.batch_normalise import (
+    build_product_summary_batch,
+    normalise_secondary_ratings_batch,
+)
+from extractors.review_utils import build_product_summary, normalise_secondary_ratings
+
+
+def _outcome(func, *args):
+    """
+    Result or exception type of a call, compared with repr so NaN == NaN
+    and 4 != 4.0.
+    """
+    try:
+        return repr(func(*args))
+    except Exception as exc:  # noqa: BLE001
+        return type(exc)
+
+
+def _assert_equivalent(reviews):
+    assert _outcome(normalise_secondary_ratings_batch, copy.deepcopy(reviews)) == _outcome(
+        normalise_secondary_ratings, copy.deepcopy(reviews)
+    )
+    assert _outcome(build_product_summary_batch, "url", "1", reviews) == _outcome(
+        build_product_summary, "url", "1", reviews
+    )
+
+
+def _review(rating=5, secondary=None, **extra):
+    review = {"Rating": rating, "Secondary Ratings": secondary or []}
+    review.update(extra)
+    return review
+
+
+EDGE_CASES = {
+    "string values": [
+        _review(4, [{"Label": "Comfort", "Value": "4"}]),
+        _review(2, [{"Label": "Comfort", "Value": "2.5"}]),
+    ],
+    "unparseable string value": [_review(4, [{"Label": "Comfort", "Value": "n/a"}])],
+    "zero value": [
+        _review(4, [{"Label": "Comfort", "Value": 0}]),
+        _review(5, [{"Label": "Comfort", "Value": 5}]),
+    ],
+    "zero value with lowercase fallback": [
+        _review(4, [{"Label": "Comfort", "Value": 0, "value": 3}]),
+    ],
+    "nan value": [_review(4, [{"Label": "Comfort", "Value": float("nan")}])],
+    "nan rating": [_review(float("nan")), _review(4)],
+    "bool ratings": [_review(True), _review(False), _review(5)],
+    "float ratings": [_review(4.7), _review(1.2), _review(9), _review(-1)],
+    "missing ratings": [_review(None), _review("5"), _review(3)],
+    "non-string labels": [
+        _review(4, [{"Label": 1, "Value": 4}, {"Label": True, "Value": 2}]),
+        _review(3, [{"Label": None, "Value": 3}, {"label": 2.5, "value": 1}]),
+    ],
+    "labels normalised": [
+        _review(4, [{"Label": " Comfort ", "Value": 4}, {"Label": "COMFORT", "Value": 3}]),
+        _review(3, [{"Label": "", "Value": 1}, {"label": "quality", "value": 2}]),
+    ],
+    "exact integer average": [_review(4), _review(5), _review(3)],
+    "bool secondary values": [_review(4, [{"Label": "Fit", "Value": True}])],
+    "huge values": [_review(4, [{"Label": "Fit", "Value": 2 ** 80}]), _review(10 ** 30)],
+    "int64 sum overflow": [_review(2 ** 62) for _ in range(3)],
+    "negative int64 sum overflow": [_review(-(2 ** 62)) for _ in range(3)],
+    "dict and odd secondary shapes": [
+        _review(4, secondaryRatings={"comfort": 4, "bad": "x"}),
+        {"Rating": 5, "Secondary Ratings": None},
+        {"Rating": 5, "Secondary Ratings": "text"},
+        _review(3, ["x", 3, {"Label": "Fit"}]),
+    ],
+    "recommendation flags": [
+        _review(5, IsRecommended=True),
+        _review(4, isRecommended="Yes"),
+        _review(3, recommended="not recommended"),
+        _review(2, Recommendation="Would not recommend"),
+        _review(1, recommendation="yes, would buy"),
+        _review(1, Recommendation=["list"]),
+    ],
+}
+
+
+@pytest.mark.parametrize("case", sorted(EDGE_CASES))
+def test_edge_cases_match_scalar_functions(case):
+    _assert_equivalent(EDGE_CASES[case])
+
+
+def test_empty_reviews_match_scalar_functions():
+    _assert_equivalent([])
+
+
+def test_random_reviews_match_scalar_functions():
+    rng = random.Random(31)
+    labels = ["Comfort", " quality ", "SIZING", "", "comfort", 1, None]
+    values = [1, 2, 3, 4, 5, 0, 4.5, 4.3, 0.1, "3", "x", None, True, False]
+    ratings = [None, "5", True, 3.7, 0, 7, -1, 5, 4, 1]
+    recommendations = [True, False, " Yes", "no", "Would recommend", "nope", "", 1]
+
+    def random_review():
+        review = {"Rating": rng.choice(ratings)}
+        for key in ("IsRecommended", "isRecommended", "recommended", "Recommendation"):
+            if rng.random() < 0.1:
+                review[key] = rng.choice(recommendations)
+        items = []
+        for _ in range(rng.randint(0, 5)):
+            label, value = rng.choice(labels), rng.choice(values)
+            if rng.random() < 0.5:
+                items.append({"Label": label, "Value": value})
+            else:
+                items.append({"label": label, "value": value})
+        review["Secondary Ratings"] = items
+        return review
+
+    for _ in range(500):
+        _assert_equivalent([random_review() for _ in range(rng.randint(1, 30))])
+
+
+def test_generator_input_is_accepted():
+    reviews = [_review(4, [{"Label": "Fit", "Value": 4}])]
+    assert normalise_secondary_ratings_batch(iter(reviews)) == normalise_secondary_ratings(
+        reviews
+    )
+
+
+def test_small_batches_leave_gc_alone(monkeypatch):
+    calls = []
+    monkeypatch.setattr(gc, "disable", lambda: calls.append("disable"))
+    normalise_secondary_ratings_batch([_review(4)] * 100)
+    assert calls == []
+
+
+def test_concurrent_large_batches_restore_gc(monkeypatch):
+    monkeypatch.setattr(batch_normalise, "GC_PAUSE_MIN_REVIEWS", 10)
+    assert gc.isenabled()
+    reviews = [_review(4, [{"Label": "Fit", "Value": 4}])] * 2000
+    threads = [
+        threading.Thread(target=normalise_secondary_ratings_batch, args=(reviews,))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert gc.isenabled()
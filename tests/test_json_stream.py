@@ -0,0 +1,155 @@
+import json
+
+import pytest
+
+from extractors import json_stream
+from extractors.json_stream import decode_review_nodes, find_review_nodes
+
+
+def _review(idx, **extra):
+    node = {
+        "@id": f"r{idx}",
+        "reviewBody": f"body {idx}",
+        "reviewRating": {"ratingValue": 5},
+        "datePublished": "2025-08-03",
+    }
+    node.update(extra)
+    return node
+
+
+def _walk_full_tree(text):
+    return find_review_nodes(json.loads(text))
+
+
+def _page_state(product_count, review_count):
+    """
+    Page-state blob with product listings either side of a review section.
+    """
+    items = [
+        {
+            "tcin": str(idx),
+            "title": f"Product {idx} {{colour}} edition",
+            "price": {"current_retail": idx / 100, "formatted": f"${idx}"},
+            "variations": [{"size": size, "in_stock": idx % 3 > 0} for size in "SML"],
+            "bullets": ["Machine wash", 'Fits "true" to size'],
+        }
+        for idx in range(product_count)
+    ]
+    reviews = [
+        _review(idx, author={"name": f"shopper{{{idx}}}"}, text='Great {fit}, "small" \\')
+        for idx in range(review_count)
+    ]
+    return {
+        "search": {"items": items[: product_count // 2]},
+        "product": {"reviews": {"results": reviews}},
+        "recommendations": {"items": items[product_count // 2:]},
+    }
+
+
+def _page_level_key(product_count, review_count):
+    """
+    Blob whose root object also owns a "reviewBody" key, after everything else.
+    """
+    state = _page_state(product_count, review_count)
+    state["reviewBody"] = "Page-level review summary"
+    return json.dumps(state)
+
+
+def _malformed_review(product_count, review_count):
+    text = json.dumps(_page_state(product_count, review_count))
+    key = text.index('"reviewRating":')
+    return text[:key] + '"reviewRating": {,' + text[key + len('"reviewRating":'):]
+
+
+@pytest.fixture
+def scanned_chars(monkeypatch):
+    """
+    Total characters handed to the bracket scanner during one decode.
+    """
+    total = {"chars": 0}
+    original = json_stream._scan_brackets
+
+    def counting(text, start, end):
+        total["chars"] += end - start
+        return original(text, start, end)
+
+    monkeypatch.setattr(json_stream, "_scan_brackets", counting)
+    return total
+
+
+def test_matches_full_decode_on_page_state():
+    text = json.dumps(_page_state(200, 20))
+    assert decode_review_nodes(text) == _walk_full_tree(text)
+
+
+def test_no_review_key_returns_empty_list():
+    assert decode_review_nodes(json.dumps({"items": [{"a": 1}]})) == []
+
+
+def test_ignores_braces_quotes_and_keys_inside_strings():
+    doc = {
+        "noise": ['{"reviewBody": 1}', "}}]]", 'quote " and \\ backslash'],
+        'key \\"reviewBody': {"x": 1},
+        "reviews": [_review(1, text="a { b"), _review(2, nested={"reviewBody": "x"})],
+    }
+    text = json.dumps(doc)
+    assert decode_review_nodes(text) == _walk_full_tree(text)
+
+
+def test_nested_owners_are_returned_in_document_order():
+    outer = _review(0, children=[_review(1), _review(2)])
+    text = json.dumps({"page": outer})
+    assert decode_review_nodes(text) == _walk_full_tree(text)
+
+
+def test_escaped_review_key_falls_back():
+    text = '{"reviews": [{"review\\u0042ody": "x", "reviewRating": 1, "datePublished": "d"}]}'
+    assert json.loads(text)["reviews"][0]["reviewBody"] == "x"
+    assert decode_review_nodes(text) is None
+
+
+def test_malformed_review_fails_fast(monkeypatch, scanned_chars):
+    text = _malformed_review(2000, 20)
+    attempts = []
+    original = json_stream._decode_object_at
+
+    def counting(text, start):
+        attempts.append(start)
+        return original(text, start)
+
+    monkeypatch.setattr(json_stream, "_decode_object_at", counting)
+    assert decode_review_nodes(text) is None
+    assert len(attempts) <= 1
+    assert scanned_chars["chars"] <= len(text)
+
+
+def test_page_level_key_beyond_owner_distance_falls_back(scanned_chars):
+    text = _page_level_key(2000, 20)
+    assert len(text) > json_stream.MAX_OWNER_DISTANCE
+    assert decode_review_nodes(text) is None
+    # The listings between the reviews and the page-level key are skipped
+    assert scanned_chars["chars"] < len(text) // 2
+
+
+def test_reviews_after_a_long_gap_are_found(scanned_chars):
+    filler = [{"id": idx, "tags": ["a", "{b}"]} for idx in range(2000)]
+    text = json.dumps({"first": [_review(1)], "filler": filler, "last": [_review(2)]})
+    nodes = decode_review_nodes(text, max_owner_distance=1000)
+    assert nodes == _walk_full_tree(text)
+    assert scanned_chars["chars"] < 3000
+
+
+def test_page_level_key_within_owner_distance_is_linear(scanned_chars):
+    text = _page_level_key(2000, 20)
+    nodes = decode_review_nodes(text, max_owner_distance=len(text))
+    assert nodes == _walk_full_tree(text)
+    assert scanned_chars["chars"] <= len(text)
+
+
+def test_review_key_check_sees_plain_and_escaped_keys():
+    plain = json.dumps({"review": [_review(1)]})
+    escaped = plain.replace('"reviewBody"', '"review\\u0042ody"')
+    assert json_stream.may_contain_review_nodes(plain)
+    assert json_stream.may_contain_review_nodes(escaped)
+    assert json_stream.may_contain_review_nodes("<p>\\u0041</p>") is False
+    assert json_stream.may_contain_review_nodes('<div data-test="review-card">') is False
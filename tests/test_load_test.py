@@ -0,0 +1,121 @@
+import random
+import urllib.error
+import urllib.request
+
+import pytest
+
+from benchmarks import load_test
+from benchmarks.load_test import run_load_test
+from benchmarks.mock_target_server import MockServerConfig, MockTargetServer
+from outputs.json_exporter import JsonExporter
+
+
+def _get(url):
+    """
+    Status and headers of a GET, without raising on error statuses.
+    """
+    try:
+        with urllib.request.urlopen(url, timeout=10) as resp:
+            resp.read()
+            return resp.status, resp.headers
+    except urllib.error.HTTPError as exc:
+        exc.read()
+        return exc.code, exc.headers
+
+
+def _expected_statuses(config, count):
+    rng = random.Random(config.seed)
+    statuses = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < config.error_rate:
+            statuses.append(503)
+        elif roll < config.error_rate + config.throttle_rate:
+            statuses.append(429)
+        else:
+            statuses.append(200)
+    return statuses
+
+
+def _fast_config(**overrides):
+    config = {"latency_ms": 0.0, "page_size_bytes": 2_000, "reviews_per_page": 3}
+    config.update(overrides)
+    return MockServerConfig(**config)
+
+
+def test_mock_server_injects_errors_at_configured_rates():
+    config = _fast_config(error_rate=0.2, throttle_rate=0.1, retry_after=7, seed=26)
+    with MockTargetServer(config) as server:
+        responses = [_get(server.product_url(str(idx))) for idx in range(300)]
+        stats = server.stats.snapshot()
+
+    statuses = [status for status, _ in responses]
+    # Fixed latency draws nothing, so requests replay the seeded sequence.
+    assert statuses == _expected_statuses(config, 300)
+    assert 0.1 < statuses.count(503) / 300 < 0.3
+    assert 0.03 < statuses.count(429) / 300 < 0.17
+    for status, headers in responses:
+        expected = None if status == 200 else "7"
+        assert headers.get("Retry-After") == expected
+    assert stats["status_counts"] == {
+        str(code): statuses.count(code) for code in set(statuses)
+    }
+
+
+def test_mock_server_can_omit_retry_after():
+    config = _fast_config(error_rate=1.0, retry_after=None, seed=1)
+    with MockTargetServer(config) as server:
+        status, headers = _get(server.product_url("1"))
+    assert status == 503
+    assert headers.get("Retry-After") is None
+
+
+def test_mock_server_rejects_invalid_rates():
+    with pytest.raises(ValueError):
+        MockServerConfig(error_rate=0.7, throttle_rate=0.5)
+
+
+def test_run_load_test_reports_every_product():
+    result = run_load_test(_fast_config(seed=3), products=5)
+    report = result.to_report()
+
+    assert set(report) == {
+        "Mode",
+        "Products",
+        "Succeeded",
+        "Failed",
+        "Wall Seconds",
+        "Products Per Second",
+        "Latency p50 ms",
+        "Latency p95 ms",
+        "Latency p99 ms",
+        "Retries",
+        "Server Status Counts",
+        "CPU Seconds",
+        "CPU Per Product ms",
+        "Max RSS KB",
+        "Tracemalloc Peak Bytes",
+        "Exit Code",
+    }
+    assert report["Mode"] == "scraper"
+    assert report["Products"] == 5
+    assert report["Succeeded"] == 5
+    assert report["Failed"] == 0
+    assert report["Server Status Counts"] == {"200": 5}
+    assert len(result.latencies) == 5
+
+
+def test_main_mode_counts_export_failures(monkeypatch):
+    def failing_write(self, records, output_path):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(JsonExporter, "write_reviews_to_file", failing_write)
+    report = run_load_test(_fast_config(seed=3), products=3, mode="main").to_report()
+
+    assert report["Failed"] == 3
+    assert report["Exit Code"] == 1
+
+
+def test_main_mode_rejects_scraper_options():
+    with pytest.raises(SystemExit):
+        load_test.parse_args(["--mode", "main", "--concurrency", "4"])
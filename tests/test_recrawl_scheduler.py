@@ -0,0 +1,163 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from scheduling.recrawl_scheduler import CrawlHistory, RecrawlScheduler
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _day(days):
+    return START + timedelta(days=days)
+
+
+def _dates(*days):
+    return [_day(d).isoformat() for d in days]
+
+
+def _crawl_windowed(history, product_id, day, per_day=5, window=10, launched=-100):
+    """
+    Crawl a product gaining ``per_day`` reviews a day whose page only shows
+    the newest ``window`` of them.
+    """
+    arrivals = int((day - launched) * per_day)
+    newest = [launched + idx / per_day for idx in range(arrivals - window, arrivals)]
+    history.record_crawl(
+        product_id=product_id,
+        product_url=f"https://example.test/p/x/-/A-{product_id}",
+        review_count=len(newest),
+        submitted_dates=_dates(*newest),
+        crawled_at=_day(day),
+    )
+
+
+def test_new_reviews_are_counted_by_date():
+    history = CrawlHistory()
+    history.record_crawl("1", "u", 3, _dates(1, 2, 3), crawled_at=_day(3))
+    history.record_crawl("1", "u", 3, _dates(3, 4, 5), crawled_at=_day(5))
+
+    first, second = history.products["1"].observations
+    assert first.new_reviews is None
+    assert second.new_reviews == 2
+
+
+def test_capped_review_window_keeps_true_rate(tmp_path):
+    history = CrawlHistory(tmp_path / "history.json")
+    for day in range(20):
+        _crawl_windowed(history, "1", day)
+
+    assert history.products["1"].review_rate() == pytest.approx(5.0, rel=0.05)
+
+    history.save()
+    reloaded = CrawlHistory(tmp_path / "history.json")
+    reloaded.load()
+    assert reloaded.products["1"].review_rate() == pytest.approx(5.0, rel=0.05)
+
+
+def test_empty_crawl_does_not_distort_rate():
+    history = CrawlHistory()
+    for day in range(20):
+        if day == 10:
+            history.record_crawl("1", "u", 0, [], crawled_at=_day(day))
+        else:
+            _crawl_windowed(history, "1", day)
+
+    product = history.products["1"]
+    assert product.last_crawled == _day(19)
+    assert product.observations[11].new_reviews == 10
+    assert product.review_rate() == pytest.approx(5.0, rel=0.05)
+
+
+def test_only_empty_crawls_give_zero_rate():
+    history = CrawlHistory()
+    history.record_crawl("1", "u", 0, [], crawled_at=_day(0))
+    history.record_crawl("1", "u", 0, [], crawled_at=_day(1))
+    assert history.products["1"].review_rate() == 0.0
+
+
+def test_history_without_dates_falls_back_to_count_delta(tmp_path):
+    path = tmp_path / "history.json"
+    path.write_text(
+        json.dumps(
+            {
+                "1": {
+                    "Product URL": "u",
+                    "Observations": [
+                        {"Crawled At": _day(0).isoformat(), "Review Count": 10},
+                        {"Crawled At": _day(2).isoformat(), "Review Count": 16},
+                        {"Crawled At": _day(3).isoformat(), "Review Count": 15},
+                    ],
+                }
+            }
+        ),
+        encoding="utf-8",
+    )
+    history = CrawlHistory(path)
+    history.load()
+
+    product = history.products["1"]
+    assert [obs.new_reviews for obs in product.observations] == [None, None, None]
+    # No review dates means no prior: 6 reviews gained over 3 days.
+    assert product.review_rate(prior_days=7.0) == pytest.approx(6 / 10)
+
+
+def test_quiet_period_decays_rate():
+    history = CrawlHistory()
+    busy = _dates(*[90 + idx / 5 for idx in range(50)])
+    history.record_crawl("busy", "u", 50, busy, crawled_at=_day(100))
+    history.record_crawl("dormant", "u", 50, busy, crawled_at=_day(400))
+
+    assert history.products["busy"].review_rate() > 1.0
+    assert history.products["dormant"].review_rate() < 0.2
+
+
+def _history_with_rates():
+    history = CrawlHistory()
+    for product_id, per_day in (("fast", 5), ("slow", 0.2)):
+        for day in range(5):
+            _crawl_windowed(history, product_id, day, per_day=per_day)
+    _crawl_windowed(history, "overdue", -40, per_day=0.2)
+    return history
+
+
+def test_plan_puts_new_and_overdue_products_first_within_budget():
+    scheduler = RecrawlScheduler(_history_with_rates(), max_age_days=30)
+    products = [(pid, f"url-{pid}") for pid in ("slow", "fast", "overdue", "new")]
+
+    plan = scheduler.plan(products, fetch_budget=3, now=_day(5))
+
+    assert [item.product_id for item in plan.selected] == ["new", "overdue", "fast"]
+    assert [item.product_id for item in plan.skipped] == ["slow"]
+    assert plan.urls == ["url-new", "url-overdue", "url-fast"]
+    assert [item.forced for item in plan.selected] == [True, True, False]
+    assert 0.0 < plan.expected_freshness() < 1.0
+
+
+def test_plan_without_budget_fetches_everything():
+    scheduler = RecrawlScheduler(_history_with_rates(), max_age_days=None)
+    plan = scheduler.plan([("slow", "a"), ("overdue", "b")], now=_day(5))
+
+    assert plan.skipped == []
+    assert not any(item.forced for item in plan.selected)
+    assert plan.expected_freshness() == 1.0
+
+
+def test_plan_report():
+    scheduler = RecrawlScheduler(_history_with_rates(), max_age_days=30)
+    products = [(pid, pid) for pid in ("slow", "fast", "overdue", "new")]
+    plan = scheduler.plan(products, fetch_budget=2, now=_day(5))
+    report = plan.to_report()
+
+    assert report["Candidates"] == 4
+    assert report["Fetches"] == 2
+    assert report["Forced"] == 2
+    assert report["Expected Freshness"] == round(plan.expected_freshness(), 4)
+    assert report["Expected Missed Reviews"] == pytest.approx(
+        sum(item.expected_new_reviews for item in plan.skipped), abs=0.01
+    )
+    curve = report["Freshness By Fetches"]
+    assert [point["Fetches"] for point in curve] == [1, 2, 3, 4]
+    assert curve[-1]["Expected Freshness"] == 1.0
+    freshness = [point["Expected Freshness"] for point in curve]
+    assert freshness == sorted(freshness)
@@ -0,0 +1,143 @@
+import logging
+
+import pytest
+
+from outputs import segment_store
+from outputs.segment_store import SUMMARY_REVIEW_ID, SegmentStore
+
+
+def _review(review_id, text="text"):
+    return {"Review ID": review_id, "Text": text}
+
+
+def _open(path, **kwargs):
+    kwargs.setdefault("fsync", False)
+    return SegmentStore(path, **kwargs)
+
+
+def test_rescrape_supersedes_whole_product(tmp_path):
+    with _open(tmp_path) as store:
+        store.write_product("p1", {"Review Count": 2}, [_review("a"), _review("b")])
+        store.write_product("p2", None, [_review("x")])
+        store.write_product("p1", {"Review Count": 2}, [_review("b", "new"), _review("c")])
+
+        assert store.review_ids("p1") == [SUMMARY_REVIEW_ID, "b", "c"]
+        assert store.get("p1", "a") is None
+        assert store.get("p1", "b")["Text"] == "new"
+
+    def check(store):
+        assert sorted(store.keys()) == [
+            ("p1", SUMMARY_REVIEW_ID),
+            ("p1", "b"),
+            ("p1", "c"),
+            ("p2", "x"),
+        ]
+        assert store.get("p1", "b")["Text"] == "new"
+        assert ("p1", "a") not in store
+
+    with _open(tmp_path) as store:
+        check(store)
+        stats = store.compact()
+        assert stats["Live Records"] == 4
+        check(store)
+
+    with _open(tmp_path) as store:
+        check(store)
+        # A re-scrape after compaction still supersedes the compacted records
+        store.write_product("p1", None, [_review("d")])
+        assert store.review_ids("p1") == ["d"]
+
+    with _open(tmp_path) as store:
+        assert store.review_ids("p1") == ["d"]
+        assert store.review_ids("p2") == ["x"]
+
+
+def test_empty_write_keeps_stored_generation(tmp_path):
+    with _open(tmp_path) as store:
+        store.write_product("p1", {"Review Count": 1}, [_review("a")])
+        assert store.write_product("p1", None, iter([])) == 0
+        assert store.review_ids("p1") == [SUMMARY_REVIEW_ID, "a"]
+
+    with _open(tmp_path) as store:
+        assert store.review_ids("p1") == [SUMMARY_REVIEW_ID, "a"]
+
+
+def test_torn_final_index_line_is_truncated_before_append(tmp_path, caplog):
+    with _open(tmp_path) as store:
+        store.write_product("p1", None, [_review("a")])
+    index_path = tmp_path / segment_store.INDEX_FILENAME
+    intact = index_path.read_bytes()
+    with index_path.open("ab") as f:
+        f.write(b"p1\tb\t1\t1\t4")
+
+    with caplog.at_level(logging.WARNING, logger=segment_store.__name__):
+        with _open(tmp_path) as store:
+            assert index_path.read_bytes() == intact
+            store.append("p1", "c", _review("c"))
+    assert "torn" in caplog.text
+
+    with _open(tmp_path) as store:
+        assert store.review_ids("p1") == ["a", "c"]
+        assert store.get("p1", "c") == _review("c")
+
+
+def test_malformed_index_lines_are_skipped(tmp_path, caplog):
+    with _open(tmp_path) as store:
+        store.write_product("p1", None, [_review("a")])
+    with (tmp_path / segment_store.INDEX_FILENAME).open("a", encoding="utf-8") as f:
+        f.write("p1\tb\tnot-a-generation\t1\t0\t10\n")
+        f.write("just one field\n")
+
+    with caplog.at_level(logging.WARNING, logger=segment_store.__name__):
+        with _open(tmp_path) as store:
+            assert store.review_ids("p1") == ["a"]
+            assert store.get("p1", "a") == _review("a")
+    assert "malformed index line 2" in caplog.text
+    assert "malformed index line 3" in caplog.text
+
+
+def test_legacy_index_lines_load_as_generation_zero(tmp_path):
+    payload = b'{"Review ID": "a"}\n'
+    (tmp_path / "segment-000001.jsonl").write_bytes(payload * 2)
+    (tmp_path / segment_store.INDEX_FILENAME).write_text(
+        f"p1\ta\t1\t0\t{len(payload)}\n"
+        f"p1\tb\t1\t{len(payload)}\t{len(payload)}\n",
+        encoding="utf-8",
+    )
+
+    with _open(tmp_path) as store:
+        assert store.review_ids("p1") == ["a", "b"]
+        assert store.get("p1", "b") == {"Review ID": "a"}
+        store.write_product("p1", None, [_review("c")])
+
+    with _open(tmp_path) as store:
+        assert store.review_ids("p1") == ["c"]
+
+
+def test_segments_roll_over_at_size_limit(tmp_path):
+    reviews = [_review(f"r{idx}", "x" * 40) for idx in range(20)]
+    with _open(tmp_path, segment_size_bytes=200) as store:
+        store.write_product("p1", None, reviews)
+        segments = store.segment_numbers()
+        assert len(segments) > 1
+        for number in segments:
+            assert (tmp_path / f"segment-{number:06d}.jsonl").stat().st_size <= 200
+        assert list(store.iter_product("p1")) == reviews
+
+    with _open(tmp_path, segment_size_bytes=200) as store:
+        assert list(store.iter_product("p1")) == reviews
+
+
+@pytest.mark.skipif(segment_store.fcntl is None, reason="needs fcntl")
+def test_second_writer_is_rejected(tmp_path):
+    with _open(tmp_path) as store:
+        store.write_product("p1", None, [_review("a")])
+        with pytest.raises(RuntimeError):
+            _open(tmp_path)
+        with _open(tmp_path, read_only=True) as reader:
+            assert reader.get("p1", "a") == _review("a")
+            with pytest.raises(RuntimeError):
+                reader.append("p1", "b", _review("b"))
+
+    with _open(tmp_path) as store:
+        assert store.review_ids("p1") == ["a"]